@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+
+## @file analyze_progressions.py
+#	 @brief statistics over a corpus of chord progression text files
+#
+#	 every file holds chord names such as 'C Am F G7', separated by spaces, commas or '|' bar
+#	 lines.  files are parsed in a process pool and every chord is resolved through the
+#	 chord index of chords(), see chord_files.  per file results are appended to a JSON lines file as soon as
+#	 they arrive, so a crashed run keeps what it finished and a rerun skips those files.
+#	 the corpus totals are chord counts, root motion in semitones, a pitch class histogram and
+#	 the most common progressions of a few chords.
+#
+#  @date 2026_10_16
+import argparse
+import collections
+import concurrent.futures
+import json
+import os
+
+import numpy as np
+
+import chord_files
+import music_theory
+
+# length of the progressions counted, in chords
+NGRAM_LENGTH = 4
+
+# most common chords and progressions kept in the summary
+TOP_COUNT = 20
+
+##	@brief statistics of one progression file, run by pool workers
+#		@param path text file of chord names
+#		@param ngram_length length of the progressions counted
+#		@return dictionary of per file statistics, JSON serializable.  {'path', 'error'} for a file
+#			that cannot be read, recorded like any result so a resumed run does not retry it
+def analyze_file(path, ngram_length=NGRAM_LENGTH):
+	tables = chord_files.chord_tables()
+	try:
+		tokens = chord_files.read_chord_tokens(path)
+	except (OSError, ValueError) as error:
+		return {'path': path, 'error': str(error)}
+	resolved = chord_files.resolve_chords(tokens)
+	ids = np.array([chord_id for chord_id in resolved if chord_id is not None], dtype=np.intp)
+
+	names = [tables.names[chord_id] for chord_id in ids]
+	ngrams = collections.Counter(' | '.join(names[i:i + ngram_length]) for i in range(len(names) - ngram_length + 1))
+	return {
+		'path': path,
+		'chords': len(ids),
+		'unknown': collections.Counter(token for token, chord_id in zip(tokens, resolved) if chord_id is None),
+		'chord_counts': collections.Counter(names),
+		'root_motion': np.bincount(np.diff(tables.roots[ids]) % 12, minlength=12).tolist(),
+		'pitch_classes': tables.pitch_classes[ids].sum(axis=0).tolist(),
+		'progressions': ngrams,
+	}
+
+## @brief CorpusStats running totals over analyzed files
+class CorpusStats(object):
+
+	def __init__(self):
+		self.files = 0
+		self.errors = 0
+		self.chords = 0
+		self.unknown = collections.Counter()
+		self.chord_counts = collections.Counter()
+		self.root_motion = np.zeros(12, dtype=np.int64)
+		self.pitch_classes = np.zeros(12, dtype=np.int64)
+		self.progressions = collections.Counter()
+
+	##	@brief add the statistics of one file
+	#		@param result dictionary from analyze_file
+	def add(self, result):
+		if 'error' in result:
+			self.errors += 1
+			return
+		self.files += 1
+		self.chords += result['chords']
+		self.unknown.update(result['unknown'])
+		self.chord_counts.update(result['chord_counts'])
+		self.root_motion += result['root_motion']
+		self.pitch_classes += result['pitch_classes']
+		self.progressions.update(result['progressions'])
+
+	##	@brief corpus summary
+	#		@param top number of most common chords and progressions to keep
+	#		@return JSON serializable dictionary
+	def summary(self, top=TOP_COUNT):
+		return {
+			'files': self.files,
+			'errors': self.errors,
+			'chords': self.chords,
+			'unknown_tokens': sum(self.unknown.values()),
+			'most_common_unknown': self.unknown.most_common(top),
+			'most_common_chords': self.chord_counts.most_common(top),
+			'root_motion_semitones': dict(zip(range(12), self.root_motion.tolist())),
+			'pitch_class_histogram': dict(zip(music_theory.CHROMATIC_PREFIXES, self.pitch_classes.tolist())),
+			'most_common_progressions': self.progressions.most_common(top),
+		}
+
+##	@brief read the results of an earlier, possibly interrupted, run
+#		@param results_path JSON lines file of per file results
+#		@param stats CorpusStats to add the results to
+#		@return set of paths already analyzed
+def load_results(results_path, stats):
+	done = set()
+	if not os.path.exists(results_path):
+		return done
+	with open(results_path) as f:
+		for line in f:
+			try:
+				result = json.loads(line)
+			except ValueError:
+				# last line of a crashed run may be cut off
+				continue
+			stats.add(result)
+			done.add(result['path'])
+	return done
+
+##	@brief analyze progression files in a process pool, appending each result as it arrives
+#		@param paths text files of chord names
+#		@param results_path JSON lines file of per file results, existing entries are kept and skipped
+#		@param workers number of worker processes, None for one per cpu, 1 to analyze in this process
+#		@param ngram_length length of the progressions counted
+#		@return CorpusStats over all files
+def analyze_corpus(paths, results_path, workers=None, ngram_length=NGRAM_LENGTH):
+	stats = CorpusStats()
+	done = load_results(results_path, stats)
+	todo = [path for path in paths if path not in done]
+
+	with open(results_path, 'a') as out:
+		def write(result):
+			stats.add(result)
+			out.write(json.dumps(result) + '\n')
+			out.flush()
+
+		if workers == 1:
+			for path in todo:
+				write(analyze_file(path, ngram_length))
+			return stats
+
+		with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+			futures = [pool.submit(analyze_file, path, ngram_length) for path in todo]
+			for future in concurrent.futures.as_completed(futures):
+				write(future.result())
+	return stats
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='statistics over a corpus of chord progression files')
+	parser.add_argument('inputs', nargs='+', help='progression files or directories of them')
+	parser.add_argument('--extension', default='.txt', help='file extension searched for in directories')
+	parser.add_argument('--results', default='progression_results.jsonl', help='per file results, appended and resumed')
+	parser.add_argument('--summary', help='write the corpus summary as JSON to this file instead of stdout')
+	parser.add_argument('--ngram', type=int, default=NGRAM_LENGTH, help='length of the progressions counted')
+	parser.add_argument('--workers', type=int, default=None, help='worker processes, default one per cpu')
+	args = parser.parse_args(argv)
+
+	stats = analyze_corpus(list(chord_files.find_files(args.inputs, args.extension)), args.results, args.workers, args.ngram)
+	summary = json.dumps(stats.summary(), indent=1)
+	if args.summary:
+		with open(args.summary, 'w') as f:
+			f.write(summary + '\n')
+	else:
+		print(summary)
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+
+## @file analyze_spectrum.py
+#	 @brief frequency domain analysis of recordings, with spectral peaks labelled by note
+#
+#	 the samples of a WAV file are memory-mapped with numpy.memmap, never read whole.  a short
+#	 time fourier transform with overlapping windows is computed chunk by chunk, the strongest
+#	 peaks of every frame are found, and each peak is labelled with the nearest note of the
+#	 pitch table behind notes_dict.  chunks are independent, so a process pool spreads them
+#	 over all cores while memory stays constant for recordings of any length.
+#
+#  @date 2026_10_16
+import argparse
+import collections
+import csv
+import functools
+import struct
+import sys
+
+import numpy as np
+
+import music_theory
+import ordered_pool
+
+FRAME_SIZE = 4096
+HOP_SIZE = 1024
+
+# frames per chunk handed to a worker
+CHUNK_FRAMES = 256
+
+# strongest peaks kept per frame, and their minimum level relative to the frame maximum
+PEAKS_PER_FRAME = 6
+PEAK_THRESHOLD = 0.05
+
+# WAV format tags
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+## layout of the sample data in a WAV file
+WavLayout = collections.namedtuple('WavLayout', ['offset', 'frames', 'channels', 'sample_rate', 'dtype', 'scale'])
+
+##	@brief find the sample data of a WAV file without reading it
+#		@param path WAV file
+#		@return WavLayout with the byte offset, frame count and numpy dtype of the samples
+def read_wav_layout(path):
+	with open(path, 'rb') as f:
+		riff, size, wave_id = struct.unpack('<4sI4s', f.read(12))
+		if riff != b'RIFF' or wave_id != b'WAVE':
+			raise ValueError("not a WAV file: %s" % path)
+		fmt = None
+		while True:
+			header = f.read(8)
+			if len(header) < 8:
+				raise ValueError("no data chunk in %s" % path)
+			chunk_id, chunk_size = struct.unpack('<4sI', header)
+			if chunk_id == b'fmt ':
+				fmt = f.read(chunk_size)
+			elif chunk_id == b'data':
+				offset = f.tell()
+				break
+			else:
+				f.seek(chunk_size, 1)
+			if chunk_size % 2:
+				f.seek(1, 1)
+	if fmt is None:
+		raise ValueError("no fmt chunk in %s" % path)
+
+	tag, channels, sample_rate, byte_rate, block_align, bits = struct.unpack('<HHIIHH', fmt[:16])
+	if tag == WAVE_FORMAT_EXTENSIBLE:
+		tag = struct.unpack('<H', fmt[24:26])[0]
+	if tag == WAVE_FORMAT_IEEE_FLOAT and bits in (32, 64):
+		dtype, scale = np.dtype('<f%d' % (bits // 8)), 1.0
+	elif tag == WAVE_FORMAT_PCM and bits == 8:
+		dtype, scale = np.dtype('u1'), 128.0
+	elif tag == WAVE_FORMAT_PCM and bits in (16, 32):
+		dtype, scale = np.dtype('<i%d' % (bits // 8)), float(2 ** (bits - 1))
+	else:
+		raise ValueError("unsupported WAV format %d with %d bit samples" % (tag, bits))
+	return WavLayout(offset, chunk_size // block_align, channels, sample_rate, dtype, scale)
+
+##	@brief memory-map the samples of a WAV file
+#		@param layout WavLayout from read_wav_layout
+#		@return read-only memmap of shape (frames, channels)
+def open_wav_memmap(path, layout):
+	return np.memmap(path, dtype=layout.dtype, mode='r', offset=layout.offset, shape=(layout.frames, layout.channels))
+
+##	@brief samples of a range of a WAV file, mixed to mono and scaled to [-1, 1]
+#		@param samples memmap from open_wav_memmap
+#		@param layout WavLayout of the file
+#		@param start first sample frame
+#		@param stop sample frame after the last, past the end of the file is zero padded
+#		@return float32 array of stop - start samples
+def read_mono(samples, layout, start, stop):
+	mono = samples[start:stop].astype(np.float32).mean(axis=1)
+	if layout.dtype == np.dtype('u1'):
+		mono -= 128.0
+	mono /= layout.scale
+	if len(mono) < stop - start:
+		mono = np.pad(mono, (0, stop - start - len(mono)))
+	return mono
+
+## @brief NoteLabeler nearest note of any frequency, by binary search over the pitch table
+class NoteLabeler(object):
+
+	##	@param tuning name of a tuning in TUNINGS, or a (note name, frequency) reference pair
+	def __init__(self, tuning='A440'):
+		catalog = music_theory.get_chord_catalog(tuning)
+		self.note_names = np.array(catalog.note_names)
+		self.all_notes = catalog.all_notes
+
+		# a frequency belongs to a note up to the geometric mean with its neighbours (50 cents)
+		self.boundaries = np.sqrt(self.all_notes[1:] * self.all_notes[:-1])
+
+	##	@brief index into note_names of the nearest note of every frequency
+	#		@param freqs array of frequencies in hz
+	#		@return int array of the same shape
+	def label(self, freqs):
+		return np.searchsorted(self.boundaries, freqs)
+
+@functools.lru_cache(maxsize=None)
+def _labeler(tuning):
+	return NoteLabeler(tuning)
+
+##	@brief spectral peaks of frames of samples
+#		@param frames array of shape (frames, FRAME_SIZE) of mono samples
+#		@param sample_rate samples per second
+#		@param peaks strongest peaks kept per frame
+#		@param threshold minimum peak level relative to the strongest bin of the frame
+#		@return (freqs, magnitudes) arrays of shape (frames, peaks), nan / 0 where a frame has fewer peaks
+def find_peaks(frames, sample_rate, peaks=PEAKS_PER_FRAME, threshold=PEAK_THRESHOLD):
+	frame_size = frames.shape[1]
+	spectrum = np.abs(np.fft.rfft(frames * np.hanning(frame_size), axis=1))
+
+	# local maxima above the threshold, everything else zeroed
+	is_peak = np.zeros(spectrum.shape, dtype=bool)
+	is_peak[:,1:-1] = (spectrum[:,1:-1] > spectrum[:,:-2]) & (spectrum[:,1:-1] >= spectrum[:,2:])
+	is_peak &= spectrum >= threshold * spectrum.max(axis=1, keepdims=True)
+	candidates = np.where(is_peak, spectrum, 0.0)
+
+	bins = np.argpartition(candidates, -peaks, axis=1)[:,-peaks:]
+	magnitudes = np.take_along_axis(candidates, bins, axis=1)
+
+	# parabolic interpolation between neighbouring bins for sub-bin frequency
+	left = np.take_along_axis(spectrum, np.maximum(bins - 1, 0), axis=1)
+	right = np.take_along_axis(spectrum, np.minimum(bins + 1, spectrum.shape[1] - 1), axis=1)
+	curvature = left - 2.0 * magnitudes + right
+	with np.errstate(divide='ignore', invalid='ignore'):
+		offset = np.where(curvature < 0, 0.5 * (left - right) / curvature, 0.0)
+	freqs = np.where(magnitudes > 0, (bins + offset) * sample_rate / float(frame_size), np.nan)
+
+	order = np.argsort(-magnitudes, axis=1)
+	return np.take_along_axis(freqs, order, axis=1), np.take_along_axis(magnitudes, order, axis=1)
+
+##	@brief analyze one chunk of frames, run by pool workers
+#		@param path WAV file
+#		@param layout WavLayout of the file
+#		@param first index of the first frame of the chunk
+#		@param count number of frames in the chunk
+#		@return (frame times in s, peak freqs, peak magnitudes, peak note indices)
+def analyze_chunk(path, layout, first, count, frame_size=FRAME_SIZE, hop_size=HOP_SIZE, tuning='A440'):
+	samples = open_wav_memmap(path, layout)
+	start = first * hop_size
+	stop = start + (count - 1) * hop_size + frame_size
+	mono = read_mono(samples, layout, start, stop)
+
+	frames = np.lib.stride_tricks.sliding_window_view(mono, frame_size)[::hop_size]
+	freqs, magnitudes = find_peaks(frames, layout.sample_rate)
+	notes = _labeler(tuning).label(np.nan_to_num(freqs))
+	times = (first + np.arange(count)) * hop_size / float(layout.sample_rate)
+	return times, freqs, magnitudes, notes
+
+##	@brief stream the spectral peaks of a WAV file, chunk by chunk and in order
+#		@param path WAV file
+#		@param frame_size samples per STFT frame
+#		@param hop_size samples between frame starts, frame_size - hop_size samples overlap
+#		@param chunk_frames frames per chunk
+#		@param workers number of worker processes, None or 1 to analyze in this process
+#		@param tuning tuning of the pitch table used for labels
+#		@return generator of (frame times, peak freqs, peak magnitudes, peak note indices) per chunk
+def analyze_file(path, frame_size=FRAME_SIZE, hop_size=HOP_SIZE, chunk_frames=CHUNK_FRAMES, workers=None, tuning='A440'):
+	layout = read_wav_layout(path)
+	total = max(0, (layout.frames - frame_size) // hop_size + 1)
+	jobs = ((path, layout, first, min(chunk_frames, total - first), frame_size, hop_size, tuning)
+		for first in range(0, total, chunk_frames))
+	return ordered_pool.imap(analyze_chunk, jobs, workers)
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='label the spectral peaks of a WAV file with note names')
+	parser.add_argument('wav', help='input WAV file')
+	parser.add_argument('-o', '--output', help='CSV file of time, frequency, magnitude, note; default stdout')
+	parser.add_argument('--frame-size', type=int, default=FRAME_SIZE, help='samples per STFT frame')
+	parser.add_argument('--hop-size', type=int, default=HOP_SIZE, help='samples between frames')
+	parser.add_argument('--tuning', choices=sorted(music_theory.TUNINGS), default='A440', help='reference pitch')
+	parser.add_argument('--workers', type=int, default=None, help='worker processes, default analyzes in this process')
+	args = parser.parse_args(argv)
+
+	note_names = _labeler(args.tuning).note_names
+	out = open(args.output, 'w', newline='') if args.output else sys.stdout
+	writer = csv.writer(out)
+	writer.writerow(['time_s', 'freq_hz', 'magnitude', 'note'])
+	for times, freqs, magnitudes, notes in analyze_file(args.wav, args.frame_size, args.hop_size, workers=args.workers, tuning=args.tuning):
+		found = magnitudes > 0
+		rows = zip(np.broadcast_to(times[:,np.newaxis], found.shape)[found].round(4).tolist(),
+			freqs[found].round(2).tolist(), magnitudes[found].round(3).tolist(), note_names[notes[found]].tolist())
+		writer.writerows(rows)
+	if args.output:
+		out.close()
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python
+
+## @file bench_music_plots.py
+#	 @brief benchmark suite for music_theory and plot_musical_notes
+#
+#	 times the note, chord and plotting hot paths at several sizes (more octaves, more roots,
+#	 larger chord vocabularies), records the peak memory of each case with tracemalloc, and
+#	 prints a table or writes JSON.  a JSON file from an earlier version can be passed with
+#	 --compare to report cases that got slower.
+#
+#	 import cases time importing the compute core (music_theory) and the plotting script in
+#	 a fresh interpreter, check that neither loads matplotlib or pandas, and compare the times
+#	 to IMPORT_TIME_BUDGET.
+#
+#	 render cases draw every figure of plot_musical_notes on the headless Agg backend, and
+#	 compare one scatter call per note (the old main() plotting loop) with a single batched
+#	 scatter_chords call on the 'all' chord catalog.
+#
+#  @date 2026_10_16
+import argparse
+import fnmatch
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+import key_detection
+import music_theory
+import piano_roll
+import plot_musical_notes as pmn
+
+# seconds a fresh interpreter may spend importing each module listed in IMPORT_MODULES
+IMPORT_TIME_BUDGET = 0.5
+IMPORT_MODULES = ['music_theory', 'plot_musical_notes']
+
+# parameterized sizes
+OCTAVE_COUNTS = [12, 80, 800]
+ROOT_COUNTS = [12, 88, 1000]
+VOCABULARY_SIZES = [25, 250, 2500]
+CLUSTER_COUNTS = [10000, 1000000]
+
+# default slowdown over the baseline reported as a regression by --compare
+REGRESSION_TOLERANCE = 0.25
+
+# slowdowns smaller than this are timer and scheduler jitter, whatever the ratio, in seconds
+REGRESSION_NOISE_FLOOR = 0.0005
+
+##	@brief a chord vocabulary of a given size: the 25 catalog chords, then random interval sets
+#		@param size number of chords
+#		@return list of lists of intervals in semitones
+def make_vocabulary(size):
+	rng = np.random.default_rng(0)
+	vocabulary = list(music_theory.CHORD_INTERVALS[:size])
+	while len(vocabulary) < size:
+		length = rng.integers(2, 8)
+		vocabulary.append([0] + sorted(rng.choice(np.arange(1, 22), length - 1, replace=False).tolist()))
+	return vocabulary
+
+##	@brief draw the chords with one scatter call per note, as main() used to
+#		@param ax matplotlib axes
+#		@param chords_dict dictionary of chord name -> list of pitches
+def scatter_per_note(ax, chords_dict):
+	idx = 0
+	for key, value in chords_dict.items():
+		for pitch in value:
+			ax.scatter(idx, pitch)
+		idx = idx + 1
+
+##	@brief build a figure with draw and render it on the Agg canvas
+#		@param draw function taking an axes and drawing on it, or a FIGURES entry taking no axes
+def render(draw, figure_function=False):
+	if figure_function:
+		fig = draw()
+	else:
+		fig, ax = plt.subplots()
+		draw(ax)
+	fig.canvas.draw()
+	plt.close(fig)
+
+##	@brief all benchmark cases
+#		@return list of (name, params, function, items), items is the number of elements one call
+#			processes and is used for throughput
+def make_cases():
+	cases = []
+
+	for octaves in OCTAVE_COUNTS:
+		suffixes = [str(octave) for octave in range(octaves)]
+		cases.append(('combine_prefix_suffix', {'octaves': octaves},
+			lambda suffixes=suffixes: music_theory.combine_prefix_suffix(music_theory.CHROMATIC_PREFIXES, suffixes, 'prefixes_first'),
+			12 * octaves))
+
+	scale = music_theory.calc_pitch_table(octaves=[-1])[0]
+	for octaves in OCTAVE_COUNTS:
+		cases.append(('calc_all_notes', {'octaves': octaves},
+			lambda octaves=octaves: music_theory.calc_all_notes(scale, octaves), 12 * octaves))
+		cases.append(('calc_pitch_table', {'octaves': octaves},
+			lambda octaves=octaves: music_theory.calc_pitch_table(np.arange(octaves) - 1), 12 * octaves))
+
+	catalog = music_theory.get_chord_catalog()
+	for size in VOCABULARY_SIZES:
+		vocabulary = make_vocabulary(size)
+		cases.append(('calc_chord_freqs', {'chords': size},
+			lambda vocabulary=vocabulary: music_theory.calc_chord_freqs(None, vocabulary, 'C4', catalog.notes_dict, catalog.all_notes, catalog.note_index),
+			size))
+
+	# roots across as many octaves as needed, every chord type of each vocabulary
+	for roots in ROOT_COUNTS:
+		octaves = np.arange(-1, roots // 12 + 3)
+		all_notes = music_theory.calc_pitch_table(octaves).ravel()
+		root_indices = np.arange(roots)
+		for size in VOCABULARY_SIZES[:2]:
+			intervals, mask = music_theory.pad_chord_intervals(make_vocabulary(size))
+			cases.append(('calc_chord_freq_table', {'roots': roots, 'chords': size},
+				lambda intervals=intervals, mask=mask, root_indices=root_indices, all_notes=all_notes:
+					music_theory.calc_chord_freq_table(intervals, mask, root_indices, all_notes),
+				roots * size))
+
+	# cold builds the catalog from scratch, warm reads the cached view
+	def chords_cold(chord_range):
+		music_theory._cached_chord_catalog.cache_clear()
+		return music_theory.chords(chord_range)
+	for chord_range in ['c', 'all']:
+		count = len(music_theory.chords(chord_range))
+		cases.append(('chords', {'range': chord_range, 'cache': 'cold'}, lambda chord_range=chord_range: chords_cold(chord_range), count))
+		cases.append(('chords', {'range': chord_range, 'cache': 'warm'}, lambda chord_range=chord_range: music_theory.chords(chord_range), count))
+
+	index = music_theory.get_chord_index()
+	rng = np.random.default_rng(0)
+	for clusters in CLUSTER_COUNTS:
+		pitch_classes = rng.integers(-1, 12, size=(clusters, 4))
+		cases.append(('identify_masks', {'clusters': clusters},
+			lambda pitch_classes=pitch_classes: index.identify_masks(music_theory.calc_pitch_class_masks(pitch_classes)),
+			clusters))
+
+	for clusters in CLUSTER_COUNTS:
+		freqs = rng.uniform(20.0, 20000.0, clusters)
+		cases.append(('quantize_frequencies', {'freqs': clusters},
+			lambda freqs=freqs: music_theory.quantize_frequencies(freqs), clusters))
+
+	temperaments = sorted(music_theory.TEMPERAMENTS)
+	cases.append(('calc_cent_deviations', {'temperaments': len(temperaments)},
+		lambda: music_theory.calc_cent_deviations(temperaments), len(temperaments) ** 2 * 300))
+
+	# every scale on every root and octave of the pitch table
+	cases.append(('calc_scale_indices', {'scales': len(music_theory.SCALES)},
+		lambda: music_theory.calc_scale_indices(octaves=music_theory.DEFAULT_OCTAVES),
+		len(music_theory.SCALES) * 12 * len(music_theory.DEFAULT_OCTAVES)))
+
+	# key of many segments in one batch, such as the sliding windows of a corpus of songs
+	histograms = np.random.default_rng(0).random((100000, 12)).astype(np.float32)
+	detector = key_detection.KeyDetector()
+	cases.append(('detect_keys', {'segments': len(histograms)}, lambda: detector.detect(histograms), len(histograms)))
+
+	# spectral peaks binned at their full extent, 10 per frame, which must keep every peak
+	times = np.repeat(np.arange(100000) * 0.01, 10)
+	points = piano_roll.PointBinner(times, rng.uniform(40.0, 90.0, len(times)))
+	x0, x1, y0, y1 = points.extent
+	if points(x0, x1, y0, y1, 1000, 400)[0].sum() != len(times):
+		raise ValueError("PointBinner drops points on the edges of its extent")
+	cases.append(('bin_points', {'points': len(times)}, lambda: points(x0, x1, y0, y1, 1000, 400), len(times)))
+
+	# every chord type in every inversion, on the 12 middle roots and on roots across 7 octaves
+	for octaves in [1, 7]:
+		root_notes = music_theory.calc_note_names(music_theory.CHROMATIC_PREFIXES, range(4 - octaves // 2, 5 + octaves // 2))
+		cases.append(('calc_chord_dissonance', {'roots': len(root_notes)},
+			lambda root_notes=root_notes: music_theory.calc_chord_dissonance(catalog, root_notes),
+			len(root_notes) * len(music_theory.CHORD_INTERVALS) * music_theory.CHORD_TABLE.shape[1]))
+
+	for name, figure in pmn.FIGURES.items():
+		cases.append(('render_figure', {'figure': name}, lambda figure=figure: render(figure, True), 1))
+
+	chords_dict = music_theory.chords('all')
+	chord_table = catalog.get_chord_table(list(chords_dict.keys()))
+	cases.append(('render_all_chords', {'method': 'per_note'},
+		lambda: render(lambda ax: scatter_per_note(ax, chords_dict)), len(chords_dict)))
+	cases.append(('render_all_chords', {'method': 'batched'},
+		lambda: render(lambda ax: pmn.scatter_chords(ax, chord_table)), len(chords_dict)))
+
+	return cases
+
+##	@brief time a function and measure its peak memory
+#		@param function function taking no arguments
+#		@param repeat number of timed runs
+#		@param min_time keep repeating fast functions until they have run this long in total
+#		@return dictionary of best and mean seconds per call, number of calls and peak bytes
+def run_case(function, repeat=5, min_time=0.2):
+	times = []
+	while len(times) < repeat or sum(times) < min_time:
+		start = time.perf_counter()
+		function()
+		times.append(time.perf_counter() - start)
+		if len(times) >= 10000:
+			break
+
+	# separate run for memory, tracemalloc slows allocation down
+	tracemalloc.start()
+	function()
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+	return {'best_s': min(times), 'mean_s': sum(times) / len(times), 'calls': len(times), 'peak_bytes': peak}
+
+##	@brief import a module in a fresh interpreter
+#		@param module module name
+#		@param repeat number of timed runs, the best is reported
+#		@return (best import time in seconds, list of heavy modules that got imported)
+def time_import(module, repeat=5):
+	code = ("import sys, time; start = time.perf_counter(); import %s; "
+		"print(time.perf_counter() - start); "
+		"print(' '.join(m for m in ('matplotlib', 'pandas') if m in sys.modules))" % module)
+	best = float('inf')
+	for i in range(repeat):
+		out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout.split('\n')
+		best = min(best, float(out[0]))
+	return best, out[1].split()
+
+##	@brief time importing each of IMPORT_MODULES against IMPORT_TIME_BUDGET
+#		@return list of result dictionaries
+def bench_import_time(repeat=5):
+	results = []
+	for module in IMPORT_MODULES:
+		seconds, heavy = time_import(module, repeat)
+		results.append({'name': 'import', 'params': {'module': module}, 'best_s': seconds, 'calls': repeat,
+			'budget_s': IMPORT_TIME_BUDGET, 'heavy_modules': heavy,
+			'within_budget': seconds <= IMPORT_TIME_BUDGET and not heavy})
+	return results
+
+##	@brief unique key of a result, such as 'calc_chord_freq_table[chords=25,roots=88]'
+def case_key(result):
+	return '%s[%s]' % (result['name'], ','.join('%s=%s' % item for item in sorted(result['params'].items())))
+
+##	@brief run the suite
+#		@param pattern fnmatch pattern on case keys, such as 'chords*' or '*render*'
+#		@param repeat minimum number of timed runs per case
+#		@return list of result dictionaries
+def run_suite(pattern='*', repeat=5):
+	results = []
+	for name, params, function, items in make_cases():
+		result = {'name': name, 'params': params}
+		if not fnmatch.fnmatch(case_key(result), pattern):
+			continue
+		result.update(run_case(function, repeat))
+		result['items_per_s'] = items / result['best_s']
+		results.append(result)
+	results.extend(result for result in bench_import_time(repeat) if fnmatch.fnmatch(case_key(result), pattern))
+	return results
+
+##	@brief cases that got slower than in a baseline run
+#		@param results results of this run
+#		@param baseline results of an earlier run, as written with --json
+#		@param tolerance allowed relative slowdown
+#		@param noise_floor allowed absolute slowdown in seconds, so microsecond cases do not fail on jitter
+#		@return list of (case key, baseline seconds, current seconds)
+def find_regressions(results, baseline, tolerance=REGRESSION_TOLERANCE, noise_floor=REGRESSION_NOISE_FLOOR):
+	baseline_times = dict((case_key(result), result['best_s']) for result in baseline)
+	regressions = []
+	for result in results:
+		key = case_key(result)
+		if key in baseline_times and result['best_s'] > baseline_times[key] * (1.0 + tolerance) + noise_floor:
+			regressions.append((key, baseline_times[key], result['best_s']))
+	return regressions
+
+def print_results(results):
+	for result in results:
+		line = "%-62s %10.6f s" % (case_key(result), result['best_s'])
+		if 'items_per_s' in result:
+			line += "  %12.0f items/s  %10d bytes peak" % (result['items_per_s'], result['peak_bytes'])
+		if 'within_budget' in result:
+			line += "  budget %.3f s  %s" % (result['budget_s'], 'ok' if result['within_budget'] else 'OVER')
+			if result['heavy_modules']:
+				line += "  loads " + ', '.join(result['heavy_modules'])
+		print(line)
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='benchmark the note, chord and plotting hot paths')
+	parser.add_argument('-k', '--filter', default='*', help="fnmatch pattern on case names, such as 'chords*'")
+	parser.add_argument('--repeat', type=int, default=5, help='minimum timed runs per case')
+	parser.add_argument('--json', help='write results as JSON to this file, - for stdout')
+	parser.add_argument('--compare', help='JSON results of an earlier run to check for regressions')
+	parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE, help='allowed relative slowdown')
+	parser.add_argument('--noise-floor', type=float, default=REGRESSION_NOISE_FLOOR, help='allowed absolute slowdown in seconds')
+	args = parser.parse_args(argv)
+
+	results = run_suite(args.filter, args.repeat)
+	report = {
+		'python': platform.python_version(),
+		'numpy': np.__version__,
+		'matplotlib': matplotlib.__version__,
+		'machine': platform.machine(),
+		'results': results,
+	}
+	if args.json == '-':
+		json.dump(report, sys.stdout, indent=1)
+	else:
+		print_results(results)
+	if args.json and args.json != '-':
+		with open(args.json, 'w') as f:
+			json.dump(report, f, indent=1)
+
+	if args.compare:
+		with open(args.compare) as f:
+			baseline = json.load(f)['results']
+		regressions = find_regressions(results, baseline, args.tolerance, args.noise_floor)
+		for key, before, after in regressions:
+			print("REGRESSION %s: %.6f s -> %.6f s" % (key, before, after))
+		if regressions:
+			sys.exit(1)
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+
+## @file chord_files.py
+#	 @brief chord progression text files and the input files of the corpus tools
+#
+#	 progression files hold chord names such as 'C Am F G7', separated by spaces, commas or '|'
+#	 bar lines, with '#' or 'b' accidentals.  every chord is resolved through the chord index
+#	 of chords() into arrays of roots and pitch classes.  shared by analyze_progressions,
+#	 key_detection and midi_songs.
+#
+#  @date 2026_10_16
+import functools
+import os
+import re
+
+import numpy as np
+
+import music_theory
+
+TOKEN_SEPARATORS = re.compile(r'[\s,|]+')
+
+# accidentals written as '#' or 'b' become the 's' sharps used by chord names
+FLATS = {'Cb': 'B', 'Db': 'Cs', 'Eb': 'Ds', 'Fb': 'E', 'Gb': 'Fs', 'Ab': 'Gs', 'Bb': 'As'}
+
+## @brief ChordTables chord index of chords() as arrays, for vectorized statistics
+class ChordTables(object):
+
+	def __init__(self):
+		index = music_theory.get_chord_index()
+		self.names = [shape.name for shape in index.shapes]
+		self.ids = dict((name, chord_id) for chord_id, name in enumerate(self.names))
+		self.roots = np.array([shape.root for shape in index.shapes])
+		masks = np.array([shape.mask for shape in index.shapes])
+		self.pitch_classes = (masks[:,np.newaxis] >> np.arange(12)) & 1
+
+	##	@brief chord id of a chord name as written in a text file
+	#		@param token chord name, such as 'C', 'Am7', 'F#m' or 'Bbmaj7'
+	#		@return index into names, or None for unknown chords
+	def resolve(self, token):
+		for name in (token, token + ' '):
+			if name in self.ids:
+				return self.ids[name]
+		token = token.replace('#', 's')
+		if token[:2] in FLATS:
+			token = FLATS[token[:2]] + token[2:]
+		for name in (token, token + ' '):
+			if name in self.ids:
+				return self.ids[name]
+		return None
+
+##	@brief the ChordTables of this process, built once
+@functools.lru_cache(maxsize=1)
+def chord_tables():
+	return ChordTables()
+
+##	@brief chord names of a progression file
+#		@param path text file of chord names
+#		@return list of chord name tokens as written
+def read_chord_tokens(path):
+	with open(path) as f:
+		return [token for token in TOKEN_SEPARATORS.split(f.read()) if token]
+
+##	@brief chord ids of chord name tokens
+#		@param tokens chord names, such as from read_chord_tokens
+#		@return list of indices into chord_tables().names, None for unknown chords
+def resolve_chords(tokens):
+	tables = chord_tables()
+	return [tables.resolve(token) for token in tokens]
+
+##	@brief files in directories and file arguments
+#		@param inputs file and directory paths
+#		@param extension file extension searched for in directories, files given directly are always kept
+#		@return generator of file paths, directories walked in sorted order
+def find_files(inputs, extension):
+	for path in inputs:
+		if os.path.isdir(path):
+			for root, dirs, files in os.walk(path):
+				dirs.sort()
+				for name in sorted(files):
+					if name.endswith(extension):
+						yield os.path.join(root, name)
+		else:
+			yield path
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+
+## @file chord_voicings.py
+#	 @brief stream every voicing of the catalog chords within a key range
+#
+#	 the first inversion of a triad puts the third in the bass, the second the fifth, and a
+#	 chord may be spread over several octaves with some notes doubled.  a voicing here is any
+#	 set of keys, lowest first, that holds every pitch class of the chord and nothing else.
+#	 for each bass note the keys above it are chosen as combinations of chord tones within
+#	 the allowed span, in numpy batches, and pruned by note count, doublings and the minimum
+#	 interval between neighbours.  voicings are yielded batch by batch, the full set is never
+#	 held in memory.
+#
+#  @date 2026_10_16
+import argparse
+import itertools
+
+import numpy as np
+
+import music_theory
+
+# keys of the 88 key piano, A0 - C8, as MIDI note numbers
+PIANO_RANGE = (21, 108)
+
+# default pruning: at most 6 keys, or one per pitch class of larger chords, within two octaves,
+# every pitch class at most twice
+MAX_NOTES = 6
+MAX_SPAN = 24
+MIN_INTERVAL = 1
+MAX_DOUBLINGS = 1
+
+# voicings per yielded batch
+BATCH_SIZE = 16384
+
+##	@brief MIDI note number of a note name
+#		@param note_name note name such as 'A0' or 'C8'
+def note_midi(note_name):
+	pitch_class, octave = music_theory.parse_note_name(note_name)
+	return (octave + 1) * 12 + pitch_class
+
+##	@brief stream the voicings of a chord
+#		@param chord_name chord name of the catalog, such as 'Am7'
+#		@param key_range (lowest, highest) MIDI note of any key
+#		@param bass_range (lowest, highest) MIDI note of the bass, defaults to key_range
+#		@param max_notes most keys per voicing, defaults to MAX_NOTES or the number of pitch classes of
+#			the chord if that is more.  fewer keys than pitch classes raise ValueError
+#		@param max_span most semitones from the bass to the top note
+#		@param min_interval fewest semitones between neighbouring keys
+#		@param max_doublings extra keys per pitch class, 0 for one key per chord tone
+#		@param batch_size voicings per batch, the last batch may be shorter
+#		@return generator of (notes, inversions) with notes an int16 array of shape (voicings,
+#			max notes) of MIDI notes, ascending and padded with -1, and inversions the int8
+#			inversion of each voicing, 0 for the root in the bass
+def enumerate_voicings(chord_name, key_range=PIANO_RANGE, bass_range=None, max_notes=None,
+		max_span=MAX_SPAN, min_interval=MIN_INTERVAL, max_doublings=MAX_DOUBLINGS, batch_size=BATCH_SIZE):
+	shape = music_theory.get_chord_index().by_name[chord_name]
+	degrees = ((shape.root + shape.intervals.astype(int)) % 12).tolist()
+	chord_pitch_classes = sorted(set(degrees))
+	if max_notes is None:
+		max_notes = max(MAX_NOTES, len(chord_pitch_classes))
+	elif max_notes < len(chord_pitch_classes):
+		raise ValueError("%s has %d pitch classes, more than %d notes" % (chord_name.strip(), len(chord_pitch_classes), max_notes))
+
+	# column of every pitch class in the count matrix, and the inversion it makes in the bass
+	column = np.full(12, -1, dtype=np.intp)
+	column[chord_pitch_classes] = np.arange(len(chord_pitch_classes))
+	inversion = np.full(12, -1, dtype=np.int8)
+	for degree, pitch_class in reversed(list(enumerate(degrees))):
+		inversion[pitch_class] = degree
+
+	low, high = key_range
+	bass_low, bass_high = bass_range if bass_range is not None else key_range
+	pending, count = [], 0
+	for bass in range(max(low, bass_low), min(high, bass_high) + 1):
+		if column[bass % 12] < 0:
+			continue
+		candidates = np.arange(bass + max(min_interval, 1), min(high, bass + max_span) + 1)
+		candidates = candidates[column[candidates % 12] >= 0]
+		for notes in _upper_voices(bass, candidates, column, len(chord_pitch_classes), max_notes,
+				min_interval, max_doublings, batch_size):
+			pending.append(notes)
+			count += len(notes)
+			if count >= batch_size:
+				# full batches out, the rest waits for the next bass note
+				notes, inversions = _flush(pending, max_notes, inversion)
+				full = len(notes) - len(notes) % batch_size
+				for start in range(0, full, batch_size):
+					yield notes[start:start + batch_size], inversions[start:start + batch_size]
+				pending, count = [notes[full:]], len(notes) - full
+	if count:
+		yield _flush(pending, max_notes, inversion)
+
+##	@brief keys above one bass note that complete the chord, one array per size of combination
+def _upper_voices(bass, candidates, column, pitch_classes, max_notes, min_interval, max_doublings, batch_size):
+	bass_counts = np.bincount([column[bass % 12]], minlength=pitch_classes)
+	missing = pitch_classes - 1
+	for size in range(missing, min(max_notes - 1, len(candidates)) + 1):
+		combinations = itertools.combinations(range(len(candidates)), size)
+		while True:
+			chunk = np.fromiter(itertools.chain.from_iterable(itertools.islice(combinations, batch_size)), dtype=np.intp)
+			if not len(chunk):
+				break
+			upper = candidates[chunk.reshape(-1, size)]
+
+			# every pitch class present, none more than max_doublings extra times
+			counts = bass_counts + (column[upper % 12][:,:,np.newaxis] == np.arange(pitch_classes)).sum(axis=1)
+			keep = (counts >= 1).all(axis=1) & (counts <= max_doublings + 1).all(axis=1)
+			if size > 1:
+				keep &= (np.diff(upper, axis=1) >= min_interval).all(axis=1)
+			if keep.any():
+				yield np.hstack([np.full((keep.sum(), 1), bass), upper[keep]])
+
+##	@brief padded batch of voicings of any sizes
+def _flush(pending, max_notes, inversion):
+	notes = np.full((sum(len(voicings) for voicings in pending), max_notes), -1, dtype=np.int16)
+	start = 0
+	for voicings in pending:
+		notes[start:start + len(voicings),:voicings.shape[1]] = voicings
+		start += len(voicings)
+	return notes, inversion[notes[:,0] % 12]
+
+##	@brief stream the voicings of many chords
+#		@param chord_names chord names, defaults to every chord of the catalog
+#		@param rules pruning keywords of enumerate_voicings
+#		@return generator of (chord name, notes, inversions) batches
+def enumerate_catalog_voicings(chord_names=None, **rules):
+	if chord_names is None:
+		chord_names = music_theory.get_chord_catalog().chord_names
+	for chord_name in chord_names:
+		for notes, inversions in enumerate_voicings(chord_name, **rules):
+			yield chord_name, notes, inversions
+
+##	@brief frequencies of voicings, for calc_dissonance or synthesis
+#		@param notes padded MIDI notes from enumerate_voicings
+#		@param catalog ChordCatalog whose pitch table is used, defaults to get_chord_catalog()
+#		@return float array of the shape of notes, nan for padding
+def voicing_freqs(notes, catalog=None):
+	if catalog is None:
+		catalog = music_theory.get_chord_catalog()
+	all_notes = np.asarray(catalog.all_notes)
+	index = np.asarray(notes, dtype=np.intp) - (catalog.octaves[0] + 1) * 12
+	valid = (np.asarray(notes) >= 0) & (index >= 0) & (index < len(all_notes))
+	return np.where(valid, all_notes[np.clip(index, 0, len(all_notes) - 1)], np.nan)
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='count chord voicings and list the most consonant ones')
+	parser.add_argument('chords', nargs='+', help="chord names, such as C Am7 G7")
+	parser.add_argument('--low', default='A0', help='lowest key')
+	parser.add_argument('--high', default='C8', help='highest key')
+	parser.add_argument('--bass-low', help='lowest bass note, default --low')
+	parser.add_argument('--bass-high', help='highest bass note, default --high')
+	parser.add_argument('--max-notes', type=int, help='most keys per voicing, default %d or one per pitch class of the chord' % MAX_NOTES)
+	parser.add_argument('--max-span', type=int, default=MAX_SPAN, help='most semitones from bass to top')
+	parser.add_argument('--min-interval', type=int, default=MIN_INTERVAL, help='fewest semitones between neighbouring keys')
+	parser.add_argument('--max-doublings', type=int, default=MAX_DOUBLINGS, help='extra keys per pitch class')
+	parser.add_argument('--top', type=int, default=10, help='most consonant voicings listed per chord')
+	args = parser.parse_args(argv)
+
+	catalog = music_theory.get_chord_catalog()
+	bass_range = (note_midi(args.bass_low or args.low), note_midi(args.bass_high or args.high))
+	for chord_name in args.chords:
+		chord_name = catalog.resolve_name(chord_name)
+
+		# keep only the best voicings of every batch, so memory stays flat
+		total, best_notes, best_scores = 0, None, np.empty(0)
+		for notes, inversions in enumerate_voicings(chord_name, (note_midi(args.low), note_midi(args.high)), bass_range,
+				args.max_notes, args.max_span, args.min_interval, args.max_doublings):
+			total += len(notes)
+			best_notes = notes if best_notes is None else np.vstack([best_notes, notes])
+			best_scores = np.concatenate([best_scores, music_theory.calc_dissonance(voicing_freqs(notes, catalog))])
+			order = np.argsort(best_scores, kind='stable')[:args.top]
+			best_notes, best_scores = best_notes[order], best_scores[order]
+
+		print("%s: %d voicings" % (chord_name.strip(), total))
+		for notes, score in zip(best_notes if best_notes is not None else [], best_scores):
+			names = music_theory.midi_note_names(notes[notes >= 0])
+			print("  %.3f  %s" % (score, ' '.join(names)))
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+
+## @file export_tables.py
+#	 @brief write the note, chord and scale tables as columnar files
+#
+#	 tables are dictionaries of column name -> numpy array, built from the arrays of the chord
+#	 catalog without going through chords() row by row.  variable length columns, the intervals
+#	 and frequencies of each chord, are a flat array of values and an array of offsets.  with
+#	 pyarrow installed they are written as Parquet or Feather list columns, otherwise as CSV
+#	 with the values of a list separated by spaces.
+#
+#  @date 2026_10_16
+import argparse
+import os
+
+import numpy as np
+
+import music_theory
+
+FORMATS = ['auto', 'parquet', 'feather', 'csv']
+
+## @brief ListColumn variable length column as flat values and offsets, row i is values[offsets[i]:offsets[i + 1]]
+class ListColumn(object):
+
+	##	@param padded array of shape (rows, max length)
+	#		@param mask True for the entries of each row that are kept
+	def __init__(self, padded, mask):
+		self.values = np.asarray(padded)[mask]
+		self.offsets = np.concatenate([[0], np.cumsum(mask.sum(axis=1))]).astype(np.int32)
+		self.padded = np.asarray(padded)
+		self.mask = mask
+
+	def __len__(self):
+		return len(self.offsets) - 1
+
+##	@brief one row per note of the pitch table
+#		@param catalog ChordCatalog
+#		@return dictionary of columns
+def note_table(catalog):
+	midi = np.arange(len(catalog.all_notes)) + (catalog.octaves[0] + 1) * 12
+	return {
+		'name': np.asarray(catalog.note_names),
+		'midi': midi.astype(np.int16),
+		'pitch_class': (midi % 12).astype(np.int8),
+		'octave': (midi // 12 - 1).astype(np.int8),
+		'freq': np.asarray(catalog.all_notes),
+	}
+
+##	@brief one row per chord of the catalog, in the order of chords('all')
+#		@param catalog ChordCatalog
+#		@return dictionary of columns
+def chord_table(catalog):
+	roots = len(catalog.root_names)
+	types = len(music_theory.CHORD_SUFFIXES)
+	freqs = np.asarray(catalog.chord_freq_table).reshape(roots * types, -1)
+	mask = np.asarray(catalog.chord_mask).reshape(roots * types, -1)
+	return {
+		'name': np.array(catalog.chord_names),
+		'root': np.repeat(np.array(catalog.root_names), types),
+		'root_pitch_class': np.repeat(np.arange(roots, dtype=np.int8), types),
+		'type': np.tile(np.array(music_theory.CHORD_SUFFIXES), roots),
+		'notes': mask.sum(axis=1).astype(np.int8),
+		'intervals': ListColumn(np.tile(music_theory.CHORD_TABLE.astype(np.int8), (roots, 1)), mask),
+		'freqs': ListColumn(freqs, mask),
+	}
+
+##	@brief one row per note of every scale in SCALES on every root of the middle c octave
+#		@param catalog ChordCatalog
+#		@return dictionary of columns
+def scale_table(catalog):
+	# every scale on each of the 12 roots, tonic at C4 - B4, in one batch, rows grouped by root
+	indices, mask = music_theory.calc_scale_indices(table_octaves=catalog.octaves)
+	indices, mask = indices.swapaxes(0, 1), mask.swapaxes(0, 1)
+	semitones = music_theory.calc_scale_table()[0]
+	roots, scales, octaves, degrees = np.nonzero(mask)
+	index = indices[mask]
+	return {
+		'root': np.array(music_theory.CHROMATIC_PREFIXES)[roots],
+		'scale': np.array(music_theory.SCALES)[scales],
+		'degree': (degrees + 1).astype(np.int8),
+		'semitones': semitones[scales, degrees].astype(np.int8),
+		'note': np.asarray(catalog.note_names)[index],
+		'midi': (index + (catalog.octaves[0] + 1) * 12).astype(np.int16),
+		'freq': np.asarray(catalog.all_notes)[index],
+	}
+
+##	@brief pyarrow, or None when it is not installed
+def _pyarrow():
+	try:
+		import pyarrow
+		import pyarrow.feather
+		import pyarrow.parquet
+	except ImportError:
+		return None
+	return pyarrow
+
+##	@brief text of a column for CSV, one str per row, built a column of the padding at a time
+def _csv_column(column):
+	if not isinstance(column, ListColumn):
+		return np.asarray(column).astype(str)
+	cells = np.where(column.mask[:,0], column.padded[:,0].astype(str), '')
+	for i in range(1, column.padded.shape[1]):
+		cells = np.char.add(cells, np.where(column.mask[:,i], np.char.add(' ', column.padded[:,i].astype(str)), ''))
+	return cells
+
+##	@brief write a table as CSV
+def write_csv(columns, path):
+	with open(path, 'w') as f:
+		f.write(','.join(columns) + '\n')
+		np.savetxt(f, np.column_stack([_csv_column(column) for column in columns.values()]), fmt='%s', delimiter=',')
+
+##	@brief write a table as Parquet or Feather
+def write_arrow(columns, path, fmt):
+	pa = _pyarrow()
+	arrays = {}
+	for name, column in columns.items():
+		if isinstance(column, ListColumn):
+			arrays[name] = pa.ListArray.from_arrays(pa.array(column.offsets), pa.array(column.values))
+		else:
+			arrays[name] = pa.array(column)
+	table = pa.table(arrays)
+	if fmt == 'parquet':
+		pa.parquet.write_table(table, path)
+	else:
+		pa.feather.write_feather(table, path)
+
+##	@brief write the note, chord and scale tables of a catalog
+#		@param output_dir directory to write to, created if needed
+#		@param fmt one of FORMATS, auto is parquet with pyarrow installed and csv otherwise
+#		@param tuning name of a tuning in TUNINGS
+#		@param temperament name in TEMPERAMENTS
+#		@return list of written file paths
+def export_tables(output_dir='.', fmt='auto', tuning='A440', temperament='equal'):
+	if fmt == 'auto':
+		fmt = 'parquet' if _pyarrow() is not None else 'csv'
+	if fmt != 'csv' and _pyarrow() is None:
+		raise ValueError("%s output needs pyarrow, use csv instead" % fmt)
+	os.makedirs(output_dir, exist_ok=True)
+
+	catalog = music_theory.get_chord_catalog(tuning, temperament=temperament)
+	paths = []
+	for name, build in [('notes', note_table), ('chords', chord_table), ('scales', scale_table)]:
+		path = os.path.join(output_dir, '%s.%s' % (name, fmt))
+		if fmt == 'csv':
+			write_csv(build(catalog), path)
+		else:
+			write_arrow(build(catalog), path, fmt)
+		paths.append(path)
+	return paths
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='write note, chord and scale tables as columnar files')
+	parser.add_argument('-o', '--output-dir', default='tables', help='directory for the tables')
+	parser.add_argument('--format', choices=FORMATS, default='auto', help='file format, auto is parquet if pyarrow is installed, else csv')
+	parser.add_argument('--tuning', choices=sorted(music_theory.TUNINGS), default='A440', help='reference pitch')
+	parser.add_argument('--temperament', choices=sorted(music_theory.TEMPERAMENTS), default='equal', help='temperament')
+	args = parser.parse_args(argv)
+
+	paths = export_tables(args.output_dir, args.format, args.tuning, args.temperament)
+	print("wrote %s" % ', '.join(paths))
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+
+## @file key_detection.py
+#	 @brief estimate the key of songs, recordings and chord progressions from pitch class histograms
+#
+#	 every key (12 tonics x the chosen modes) has a 12 value profile of how strongly each pitch
+#	 class belongs to it: the krumhansl-kessler probe tone profiles for major and minor, and
+#	 weighted scale templates built from SCALE_STEPS for the other modes.  profiles and
+#	 histograms are normalized to zero mean and unit length, so one matrix multiply gives the
+#	 pearson correlation of every segment with every key, in chunks like recognize_chords.
+#	 sliding windows are summed from a cumulative sum of the histograms, so detecting
+#	 modulations along a song costs one subtraction per window before the multiply.
+#
+#  @date 2026_10_16
+import argparse
+import concurrent.futures
+import functools
+import json
+import struct
+
+import numpy as np
+
+import chord_files
+import music_theory
+
+# krumhansl-kessler probe tone ratings of the 12 pitch classes above the tonic
+KRUMHANSL_MAJOR = [6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88]
+KRUMHANSL_MINOR = [6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17]
+
+# weights of the scale templates of other modes: tonic, a minor or major third and a perfect fifth
+# above it where the scale has them, other scale notes
+TONIC_WEIGHT = 2.0
+TRIAD_WEIGHT = 1.5
+SCALE_WEIGHT = 1.0
+
+# modes of the detected keys by default.  'major' and 'minor' use the probe tone profiles,
+# any name in SCALES its scale template
+KEY_MODES = ['major', 'minor']
+
+# segments correlated per matrix multiply
+CHUNK_SEGMENTS = 16384
+
+# length of the time bins of MIDI note histograms, in seconds
+BIN_SECONDS = 0.25
+
+# sliding window length and hop of modulation detection, in seconds, or chords for progressions
+WINDOW = 16.0
+HOP = 4.0
+
+##	@brief weights of the pitch classes above the tonic for a mode
+#		@param mode 'major', 'minor', or a name or step sequence accepted by scale_steps
+#		@return float array of 12 weights, the tonic first
+def calc_mode_profile(mode):
+	if isinstance(mode, str) and mode == 'major':
+		return np.array(KRUMHANSL_MAJOR)
+	if isinstance(mode, str) and mode == 'minor':
+		return np.array(KRUMHANSL_MINOR)
+	semitones = music_theory.calc_scale_semitones(mode)[:-1]
+	profile = np.zeros(12)
+	profile[semitones] = SCALE_WEIGHT
+	# by interval, not by degree, so pentatonic and symmetric scales stress the right notes
+	triad = np.intersect1d(semitones, [music_theory.MINOR_THIRD, music_theory.MAJOR_THIRD, music_theory.PERFECT_FIFTH])
+	profile[triad] = TRIAD_WEIGHT
+	profile[0] = TONIC_WEIGHT
+	return profile
+
+##	@brief the profile of every key, every mode transposed to all 12 tonics in one gather
+#		@param modes modes accepted by calc_mode_profile
+#		@return (profiles, names) with profiles of shape (keys, 12), zero mean and unit length,
+#			mode-major, and names such as 'C major' or 'Fs dorian'
+def calc_key_profiles(modes=KEY_MODES):
+	profiles = np.array([calc_mode_profile(mode) for mode in modes])
+	# profile of tonic t at pitch class p is the mode profile at p - t
+	above_tonic = (np.arange(12)[np.newaxis,:] - np.arange(12)[:,np.newaxis]) % 12
+	profiles = profiles[:,above_tonic].reshape(-1, 12)
+	profiles -= profiles.mean(axis=1, keepdims=True)
+	profiles /= np.linalg.norm(profiles, axis=1, keepdims=True)
+	names = ['%s %s' % (tonic, mode if isinstance(mode, str) else '-'.join(str(step) for step in mode))
+		for mode in modes for tonic in music_theory.CHROMATIC_PREFIXES]
+	return profiles.astype(np.float32), names
+
+##	@brief sums of consecutive histograms in sliding windows, from one cumulative sum
+#		@param histograms array of shape (bins, 12)
+#		@param window bins per window
+#		@param hop bins between window starts
+#		@return (first bin of every window, window sums of shape (windows, 12)).  a single
+#			window covers everything when there are fewer bins than one window
+def sliding_windows(histograms, window, hop):
+	histograms = np.asarray(histograms, dtype=np.float64)
+	window = max(1, min(int(window), len(histograms)))
+	starts = np.arange(0, len(histograms) - window + 1, max(1, int(hop)))
+	totals = np.concatenate([np.zeros((1, 12)), np.cumsum(histograms, axis=0)])
+	return starts, totals[starts + window] - totals[starts]
+
+## @brief KeyDetector best matching key of pitch class histograms
+class KeyDetector(object):
+
+	##	@param modes modes of the detected keys, see calc_mode_profile
+	def __init__(self, modes=KEY_MODES):
+		self.profiles, names = calc_key_profiles(modes)
+		self.key_names = np.array(names)
+
+	##	@brief correlate histograms with every key profile
+	#		@param histograms array of shape (segments, 12), such as note durations or chroma, C first
+	#		@param chunk_segments segments correlated per matrix multiply
+	#		@return (key indices into key_names, pearson correlations), -1 / 0 for segments with
+	#			no notes or all pitch classes equal
+	def detect(self, histograms, chunk_segments=CHUNK_SEGMENTS):
+		histograms = np.asarray(histograms, dtype=np.float32).reshape(-1, 12)
+		keys = np.empty(len(histograms), dtype=np.int16)
+		scores = np.empty(len(histograms), dtype=np.float32)
+		for start in range(0, len(histograms), chunk_segments):
+			chunk = histograms[start:start + chunk_segments]
+			centered = chunk - chunk.mean(axis=1, keepdims=True)
+			norms = np.linalg.norm(centered, axis=1)
+			flat = norms <= np.finfo(np.float32).eps * np.abs(chunk).sum(axis=1)
+			correlation = (centered @ self.profiles.T) / np.where(flat, 1.0, norms)[:,np.newaxis]
+			best = np.argmax(correlation, axis=1)
+			keys[start:start + len(chunk)] = np.where(flat, -1, best)
+			scores[start:start + len(chunk)] = np.where(flat, 0.0, correlation[np.arange(len(chunk)), best])
+		return keys, scores
+
+	##	@brief key of every sliding window, to follow modulations
+	#		@param histograms array of shape (bins, 12)
+	#		@param window bins per window
+	#		@param hop bins between window starts
+	#		@return (first bin of every window, keys, scores), see detect
+	def detect_windows(self, histograms, window, hop):
+		starts, sums = sliding_windows(histograms, window, hop)
+		keys, scores = self.detect(sums)
+		return starts, keys, scores
+
+	##	@brief names of detected keys, '' where no key was found
+	#		@param keys key indices from detect
+	def names(self, keys):
+		return np.where(keys >= 0, self.key_names[np.maximum(keys, 0)], '')
+
+##	@brief time spent on every pitch class in fixed time bins, split exactly at bin edges
+#		@param starts start times of the notes
+#		@param ends end times of the notes
+#		@param notes MIDI note numbers
+#		@param bin_seconds length of a bin
+#		@return (bin start times, histograms of shape (bins, 12) in seconds)
+def span_histograms(starts, ends, notes, bin_seconds=BIN_SECONDS):
+	if not len(starts):
+		return np.zeros(0), np.zeros((0, 12))
+	edges = np.arange(0.0, np.max(ends) + bin_seconds, bin_seconds)
+
+	# notes sounding per pitch class after each note on or off, in time order
+	times = np.concatenate([starts, ends])
+	order = np.argsort(times, kind='stable')
+	times = times[order]
+	changes = np.zeros((len(times), 12))
+	changes[np.arange(len(times)), np.concatenate([notes, notes])[order] % 12] = np.repeat([1.0, -1.0], len(starts))[order]
+	sounding = np.cumsum(changes, axis=0)
+
+	# sounding time per pitch class up to each event, and up to each bin edge from the event before it
+	elapsed = np.concatenate([np.zeros((1, 12)), np.cumsum(sounding[:-1] * np.diff(times)[:,np.newaxis], axis=0)])
+	before = np.searchsorted(times, edges, side='right') - 1
+	at_edges = np.where((before >= 0)[:,np.newaxis],
+		elapsed[before] + sounding[before] * (edges - times[np.maximum(before, 0)])[:,np.newaxis], 0.0)
+	return edges[:-1], np.diff(at_edges, axis=0)
+
+##	@brief pitch classes of the chords of a progression file, one histogram per chord
+#		@param path text file of chord names, see chord_files
+#		@return (chord positions, histograms of shape (chords, 12)), unknown chords are left out
+def progression_histograms(path):
+	tables = chord_files.chord_tables()
+	ids = chord_files.resolve_chords(chord_files.read_chord_tokens(path))
+	ids = np.array([chord_id for chord_id in ids if chord_id is not None], dtype=np.intp)
+	return np.arange(len(ids), dtype=float), tables.pitch_classes[ids].astype(float).reshape(-1, 12)
+
+##	@brief pitch class histograms of a MIDI file, WAV file or chord progression text file
+#		@param path input file, by extension: .mid / .midi, .wav, or chord names in any other file
+#		@return (bin times, histograms of shape (bins, 12), bin length in the units of the times)
+def read_histograms(path):
+	extension = path.lower().rsplit('.', 1)[-1]
+	if extension in ('mid', 'midi'):
+		import midi_songs
+		starts, ends, notes, channels = midi_songs.read_note_spans(path)
+		pitched = channels != midi_songs.PERCUSSION_CHANNEL
+		times, histograms = span_histograms(starts[pitched], ends[pitched], notes[pitched])
+		return times, histograms, BIN_SECONDS
+	if extension == 'wav':
+		import analyze_spectrum
+		import recognize_chords
+		chunks = list(recognize_chords.wav_chroma(path))
+		times = np.concatenate([times for times, chroma in chunks]) if chunks else np.zeros(0)
+		chroma = np.vstack([chroma for times, chroma in chunks]) if chunks else np.zeros((0, 12))
+		return times, chroma, analyze_spectrum.HOP_SIZE / float(analyze_spectrum.read_wav_layout(path).sample_rate)
+	times, histograms = progression_histograms(path)
+	return times, histograms, 1.0
+
+##	@brief key of a whole file and its modulations, run by pool workers
+#		@param path input file, see read_histograms
+#		@param modes modes of the detected keys
+#		@param window sliding window length, in seconds, or chords for progression files
+#		@param hop time between windows, in the same units
+#		@return JSON serializable dictionary, {'path', 'error'} for a file that cannot be read, so
+#			one bad file does not stop a run over a corpus
+def analyze_key(path, modes=KEY_MODES, window=WINDOW, hop=HOP):
+	detector = KeyDetector(modes)
+	try:
+		times, histograms, bin_length = read_histograms(path)
+	except (OSError, ValueError, struct.error) as error:
+		return {'path': path, 'error': str(error)}
+	keys, scores = detector.detect(histograms.sum(axis=0))
+
+	# a modulation is every window whose key differs from the window before it
+	starts, window_keys, window_scores = detector.detect_windows(histograms, round(window / bin_length), round(hop / bin_length))
+	changes = np.nonzero(np.diff(window_keys, prepend=-2))[0]
+	names = detector.names(window_keys[changes])
+	return {
+		'path': path,
+		'key': str(detector.names(keys)[0]),
+		'score': round(float(scores[0]), 3),
+		'modulations': [(round(float(times[starts[change]]), 3) if len(times) else 0.0, str(name), round(float(window_scores[change]), 3))
+			for change, name in zip(changes, names)],
+	}
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='estimate the key and the modulations of songs, recordings and chord progressions')
+	parser.add_argument('inputs', nargs='+', help='MIDI, WAV or chord progression files, or directories of them')
+	parser.add_argument('--extension', default='.mid', help='file extension searched for in directories')
+	parser.add_argument('--modes', nargs='+', default=KEY_MODES, choices=KEY_MODES + music_theory.SCALES, help='modes of the keys')
+	parser.add_argument('--window', type=float, default=WINDOW, help='window of modulation detection, in seconds or chords')
+	parser.add_argument('--hop', type=float, default=HOP, help='time between windows, in seconds or chords')
+	parser.add_argument('--workers', type=int, default=None, help='worker processes, default one per cpu')
+	args = parser.parse_args(argv)
+
+	# one JSON line per file, in input order
+	paths = list(chord_files.find_files(args.inputs, args.extension))
+	analyze = functools.partial(analyze_key, modes=args.modes, window=args.window, hop=args.hop)
+	if args.workers == 1:
+		for path in paths:
+			print(json.dumps(analyze(path)))
+		return
+	with concurrent.futures.ProcessPoolExecutor(max_workers=args.workers) as pool:
+		for result in pool.map(analyze, paths, chunksize=4):
+			print(json.dumps(result))
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+
+## @file midi_songs.py
+#	 @brief read standard MIDI files as a stream of notes, label their chords and plot songs
+#
+#	 a MIDI file is memory-mapped and every track is parsed lazily by its own generator.  the
+#	 tracks are merged in time order with heapq.merge, and tempo changes from any track convert
+#	 ticks to seconds as the merged stream goes by, so memory does not depend on the length of
+#	 a song.  the notes sounding between two events form a segment, the pitch class set of each
+#	 segment is looked up in the chord index of chords('all') in numpy batches, and the notes are
+#	 mapped to frequencies through the pitch table behind notes_dict.  a folder of songs is
+#	 analyzed in a process pool.
+#
+#  @date 2026_10_16
+import argparse
+import collections
+import concurrent.futures
+import heapq
+import itertools
+import json
+import mmap
+import struct
+
+import numpy as np
+
+import chord_files
+import music_theory
+
+# channel 10 holds percussion in general MIDI, its notes are not pitches
+PERCUSSION_CHANNEL = 9
+
+# microseconds per quarter note until the first tempo event, 120 bpm
+DEFAULT_TEMPO = 500000
+
+# chord segments labelled per batch
+SEGMENT_BATCH = 4096
+
+# most common chords kept in a song summary
+TOP_COUNT = 10
+
+# chord changes labelled in a song plot, longer songs are plotted without labels
+MAX_CHORD_LABELS = 200
+
+# raw event kinds of the track parsers
+_NOTE = 0
+_TEMPO = 1
+
+## a note on or off, velocity 0 for off, time in seconds
+MidiEvent = collections.namedtuple('MidiEvent', ['time', 'track', 'channel', 'note', 'velocity'])
+
+##	@brief header of a standard MIDI file
+#		@param data bytes or mmap of the file
+#		@return (format, number of tracks, division, offset of the first chunk after the header)
+def read_header(data):
+	if len(data) < 14:
+		raise ValueError("not a standard MIDI file")
+	chunk_id, length = struct.unpack_from('>4sI', data, 0)
+	if chunk_id != b'MThd':
+		raise ValueError("not a standard MIDI file")
+	midi_format, tracks, division = struct.unpack_from('>HHH', data, 8)
+	return midi_format, tracks, division, 8 + length
+
+##	@brief offsets of the track chunks of a MIDI file, other chunks are skipped
+def _track_chunks(data, offset):
+	while offset + 8 <= len(data):
+		chunk_id, length = struct.unpack_from('>4sI', data, offset)
+		start = offset + 8
+		offset = start + length
+		if chunk_id == b'MTrk':
+			# a cut off last track is parsed up to the end of the file, and fails where it stops
+			yield start, min(offset, len(data))
+
+##	@brief raw events of one track, parsed on demand
+#		@return generator of (tick, track, kind, channel or tempo, note, velocity)
+#		@throws ValueError for a track that ends inside an event or data without a status byte
+def _track_events(data, start, end, track):
+	tick = 0
+	status = 0
+	pos = start
+	while pos < end:
+		# delta time, a variable length quantity
+		delta = 0
+		while True:
+			if pos >= end:
+				raise ValueError("track %d is truncated at byte %d" % (track, pos))
+			byte = data[pos]
+			pos += 1
+			delta = (delta << 7) | (byte & 0x7F)
+			if byte < 0x80:
+				break
+		tick += delta
+
+		if pos >= end:
+			raise ValueError("track %d is truncated at byte %d" % (track, pos))
+		byte = data[pos]
+		if byte >= 0x80:
+			pos += 1
+			if byte < 0xF0:
+				status = byte
+		elif status == 0:
+			raise ValueError("data byte without running status in track %d" % track)
+		else:
+			byte = status
+
+		if byte == 0xFF or byte == 0xF0 or byte == 0xF7:
+			# meta or system exclusive: optional type, then a length and the payload
+			meta_type = -1
+			if byte == 0xFF:
+				if pos >= end:
+					raise ValueError("track %d is truncated at byte %d" % (track, pos))
+				meta_type = data[pos]
+				pos += 1
+			length = 0
+			while True:
+				if pos >= end:
+					raise ValueError("track %d is truncated at byte %d" % (track, pos))
+				value = data[pos]
+				pos += 1
+				length = (length << 7) | (value & 0x7F)
+				if value < 0x80:
+					break
+			if pos + length > end:
+				raise ValueError("track %d is truncated at byte %d" % (track, pos))
+			if meta_type == 0x51 and length == 3:
+				yield tick, track, _TEMPO, (data[pos] << 16) | (data[pos + 1] << 8) | data[pos + 2], 0, 0
+			elif meta_type == 0x2F:
+				return
+			pos += length
+			continue
+
+		kind = byte & 0xF0
+		size = 1 if kind == 0xC0 or kind == 0xD0 else 2
+		if pos + size > end:
+			raise ValueError("track %d is truncated at byte %d" % (track, pos))
+		if kind == 0x90 or kind == 0x80:
+			yield tick, track, _NOTE, byte & 0x0F, data[pos], data[pos + 1] if kind == 0x90 else 0
+		pos += size
+
+##	@brief stream the note events of a MIDI file in time order, over all tracks
+#		@param path standard MIDI file, format 0 or 1
+#		@return generator of MidiEvent, note offs before note ons at the same time and track
+def read_midi_events(path):
+	with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+		midi_format, tracks, division, offset = read_header(data)
+		parsers = [_track_events(data, start, end, track) for track, (start, end) in enumerate(_track_chunks(data, offset))]
+
+		if division & 0x8000:
+			# smpte time: frames per second and ticks per frame, tempo events do not apply
+			frames = 256 - (division >> 8)
+			seconds_per_tick, ticks_per_quarter = 1.0 / (frames * (division & 0xFF)), None
+		else:
+			ticks_per_quarter = division
+			seconds_per_tick = DEFAULT_TEMPO * 1e-6 / ticks_per_quarter
+
+		last_tick, seconds = 0, 0.0
+		for tick, track, kind, channel, note, velocity in heapq.merge(*parsers, key=lambda event: (event[0], event[5] > 0)):
+			seconds += (tick - last_tick) * seconds_per_tick
+			last_tick = tick
+			if kind == _TEMPO:
+				if ticks_per_quarter is not None:
+					seconds_per_tick = channel * 1e-6 / ticks_per_quarter
+				continue
+			yield MidiEvent(seconds, track, channel, note, velocity)
+
+##	@brief frequencies of MIDI note numbers from the pitch table of a catalog
+#		@param notes int array of MIDI note numbers
+#		@param catalog ChordCatalog, defaults to get_chord_catalog()
+#		@return float array of the shape of notes
+def note_freqs(notes, catalog=None):
+	if catalog is None:
+		catalog = music_theory.get_chord_catalog()
+	index = np.asarray(notes) - (catalog.octaves[0] + 1) * 12
+	return np.asarray(catalog.all_notes)[index]
+
+##	@brief spans of time with the same set of sounding notes
+#		@param events MidiEvent stream, such as from read_midi_events
+#		@param skip_channels channels left out, percussion by default
+#		@return generator of (start, end, 12 bit pitch class mask, lowest sounding note), one per span
+#			with at least one note.  repeated notes on one key are counted until every one is off
+def chord_segments(events, skip_channels=(PERCUSSION_CHANNEL,)):
+	sounding = collections.Counter()
+	start = None
+	for event in events:
+		if event.channel in skip_channels:
+			continue
+		if start is not None and event.time > start and sounding:
+			yield start, event.time, sum(1 << pitch_class for pitch_class in set(note % 12 for note in sounding)), min(sounding)
+		start = event.time
+		if event.velocity:
+			sounding[event.note] += 1
+		elif sounding[event.note] > 1:
+			sounding[event.note] -= 1
+		else:
+			sounding.pop(event.note, None)
+
+##	@brief chord names of segments, looked up in numpy batches
+#		@param segments stream of (start, end, mask, bass) from chord_segments
+#		@param batch segments per lookup
+#		@return generator of (starts, ends, chord names, bass notes) arrays, '' where no chord matches
+def label_segments(segments, batch=SEGMENT_BATCH):
+	index = music_theory.get_chord_index()
+	names = np.array([shape.name for shape in index.shapes] + [''])
+	segments = iter(segments)
+	while True:
+		chunk = np.array(list(itertools.islice(segments, batch)), dtype=float).reshape(-1, 4)
+		if not len(chunk):
+			return
+		chords = index.identify_masks(chunk[:,2].astype(np.intp))
+		yield chunk[:,0], chunk[:,1], names[chords], chunk[:,3].astype(np.int16)
+
+##	@brief statistics of one song, run by pool workers
+#		@param path standard MIDI file
+#		@return JSON serializable dictionary, {'path', 'error'} for a file that cannot be read, so
+#			one bad file does not stop a run over an archive
+def analyze_song(path):
+	events = 0
+	notes = np.zeros(128, dtype=np.int64)
+	def counted(stream):
+		nonlocal events
+		for event in stream:
+			events += 1
+			if event.velocity and event.channel != PERCUSSION_CHANNEL:
+				notes[event.note] += 1
+			yield event
+
+	chord_time = collections.Counter()
+	changes, previous, duration = 0, None, 0.0
+	try:
+		for starts, ends, names, basses in label_segments(chord_segments(counted(read_midi_events(path)))):
+			for name, length in zip(names.tolist(), (ends - starts).tolist()):
+				if name:
+					chord_time[name.strip()] += length
+			changes += int(np.count_nonzero(names[1:] != names[:-1])) + int(previous is not None and names[0] != previous)
+			previous, duration = names[-1], ends[-1]
+	except (OSError, ValueError) as error:
+		return {'path': path, 'error': str(error)}
+
+	played = np.nonzero(notes)[0]
+	return {
+		'path': path,
+		'events': events,
+		'notes': int(notes.sum()),
+		'duration_s': round(float(duration), 3),
+		'lowest_hz': float(note_freqs(played[0])) if len(played) else None,
+		'highest_hz': float(note_freqs(played[-1])) if len(played) else None,
+		'chord_changes': changes,
+		'most_common_chords': [(name, round(seconds, 3)) for name, seconds in chord_time.most_common(TOP_COUNT)],
+	}
+
+##	@brief pair the note ons and offs of a MIDI file into notes with a duration
+#		@param path standard MIDI file
+#		@return (starts, ends, notes, channels) arrays in order of the note offs, notes still on
+#			at the end of the file are left out
+def read_note_spans(path):
+	spans, active = [], {}
+	for event in read_midi_events(path):
+		key = (event.track, event.channel, event.note)
+		if event.velocity:
+			active.setdefault(key, collections.deque()).append(event.time)
+		elif active.get(key):
+			spans.append((active[key].popleft(), event.time, event.note, event.channel))
+	spans = np.array(spans, dtype=float).reshape(-1, 4)
+	return spans[:,0], spans[:,1], spans[:,2].astype(np.int16), spans[:,3].astype(np.int8)
+
+##	@brief plot a song as a level of detail piano roll with its chords
+#		@param path standard MIDI file
+#		@param axis_style y axis labels, one of piano_roll.AXIS_STYLES
+#		@return figure
+def plot_song(path, axis_style='note names'):
+	import piano_roll
+
+	starts, ends, notes, channels = read_note_spans(path)
+	pitched = channels != PERCUSSION_CHANNEL
+	view = piano_roll.plot_piano_roll(starts[pitched], ends[pitched], notes[pitched], axis_style=axis_style)
+	ax = view.ax
+
+	# chord name at every chord change, on top of the plot, unless there are too many to read
+	changes = []
+	previous = None
+	for starts, ends, names, basses in label_segments(chord_segments(read_midi_events(path))):
+		for start, name in zip(starts.tolist(), names.tolist()):
+			if name and name != previous:
+				changes.append((start, name.strip()))
+			previous = name
+	if len(changes) <= MAX_CHORD_LABELS:
+		bottom, top = ax.get_ylim()
+		top += 3
+		ax.set_ylim(bottom, top)
+		for start, name in changes:
+			ax.text(start, top, name, fontsize=7, rotation=90, va='top')
+	ax.set_title(path)
+	return ax.figure
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='summarize the notes and chords of MIDI files')
+	parser.add_argument('inputs', nargs='+', help='MIDI files or directories of them')
+	parser.add_argument('--extension', default='.mid', help='file extension searched for in directories')
+	parser.add_argument('--plot', help='save the piano roll of the first file to this image instead')
+	parser.add_argument('--workers', type=int, default=None, help='worker processes, default one per cpu')
+	args = parser.parse_args(argv)
+
+	paths = list(chord_files.find_files(args.inputs, args.extension))
+	if args.plot:
+		import matplotlib
+		matplotlib.use('Agg')
+		plot_song(paths[0]).savefig(args.plot, bbox_inches='tight')
+		return
+
+	# one JSON line per song, in input order
+	if args.workers == 1:
+		for path in paths:
+			print(json.dumps(analyze_song(path)))
+		return
+	with concurrent.futures.ProcessPoolExecutor(max_workers=args.workers) as pool:
+		for result in pool.map(analyze_song, paths, chunksize=4):
+			print(json.dumps(result))
+
+if __name__ == '__main__':
+	main()
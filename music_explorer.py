@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+
+## @file music_explorer.py
+#	 @brief one interactive window to explore scales, modes and chords
+#
+#	 radio buttons pick the root, the scale or mode, the chord type and the axis style.  the
+#	 top axes show one octave of the scale with its note names and T / S steps, the bottom axes
+#	 the chosen chord type on every degree of the scale, or all 300 chords of the catalog.
+#	 all data artists are created once and animated: a selection only changes their data with
+#	 set_data / set_offsets / set_position and blits them over a cached background.  the
+#	 figure is redrawn in full only when the axes themselves change, for another axis style
+#	 or when switching to and from the full catalog.
+#
+#  @date 2026_10_16
+import argparse
+
+import numpy as np
+
+import music_theory
+
+# y axis styles, and the chord entry that shows the whole catalog
+AXIS_STYLES = ['hz', 'log hz', 'semitones', 'note names']
+ALL_CHORDS = 'all'
+
+# radio button labels of the chord types, major triads have an empty suffix
+CHORD_LABELS = [ALL_CHORDS] + [suffix.strip() or 'major' for suffix in music_theory.CHORD_SUFFIXES]
+DEGREE_NAMES = ['I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X', 'XI', 'XII']
+
+# roots are in the middle c octave, the plots span C4 up to the top of a 13th chord on B4
+MIDDLE_C = 60
+SCALE_RANGE = (MIDDLE_C - 2, MIDDLE_C + 26)
+CHORD_RANGE = (MIDDLE_C - 2, MIDDLE_C + 35)
+
+## @brief MusicExplorer the explorer window and its state
+class MusicExplorer(object):
+
+	##	@param tuning name of a tuning in TUNINGS, or a (note name, frequency) reference pair
+	def __init__(self, tuning='A440'):
+		import matplotlib.collections
+		import matplotlib.pyplot as plt
+		import matplotlib.widgets
+
+		self.catalog = music_theory.get_chord_catalog(tuning)
+		self.all_notes = np.asarray(self.catalog.all_notes)
+		self.midi_offset = (self.catalog.octaves[0] + 1) * 12
+		self.root = 0
+		self.scale = 'ionian'
+		self.chord = ' '
+		self.axis_style = 'hz'
+		self.background = None
+
+		self.fig = plt.figure(figsize=(13, 8))
+		self.scale_ax = self.fig.add_axes([0.33, 0.56, 0.64, 0.38])
+		self.chord_ax = self.fig.add_axes([0.33, 0.08, 0.64, 0.38])
+
+		# animated artists, redrawn by blitting on every selection
+		self.scale_line, = self.scale_ax.plot([], [], '-o', animated=True)
+		self.note_texts = [self.scale_ax.text(0, 0, '', ha='center', va='bottom', fontsize=9, animated=True) for i in range(13)]
+		self.step_texts = [self.scale_ax.text(0, 0, '', ha='center', va='top', fontsize=12, animated=True) for i in range(12)]
+		self.chord_scatter = self.chord_ax.scatter([], [], s=20, zorder=2, animated=True)
+		self.chord_lines = matplotlib.collections.LineCollection([], colors='0.7', zorder=1, animated=True)
+		self.chord_ax.add_collection(self.chord_lines)
+		self.chord_texts = [self.chord_ax.text(0, 0, '', ha='center', va='bottom', fontsize=9, animated=True) for i in range(12)]
+		self.scale_ax.title.set_animated(True)
+		self.chord_ax.title.set_animated(True)
+		self.cycle = np.array(plt.rcParams['axes.prop_cycle'].by_key()['color'])
+
+		# widgets, each keeps a reference so it stays responsive
+		self.widgets = []
+		for rect, title, labels, callback, active in [
+				([0.02, 0.52, 0.1, 0.42], 'root', music_theory.CHROMATIC_PREFIXES, self.set_root, 0),
+				([0.14, 0.42, 0.15, 0.52], 'scale', music_theory.SCALES, self.set_scale, 0),
+				([0.14, 0.16, 0.15, 0.2], 'axis', AXIS_STYLES, self.set_axis_style, 0),
+				([0.02, 0.04, 0.1, 0.44], 'chord', CHORD_LABELS, self.set_chord, 1)]:
+			ax = self.fig.add_axes(rect)
+			ax.set_title(title, fontsize=10)
+			radio = matplotlib.widgets.RadioButtons(ax, labels, active=active)
+			for label in radio.labels:
+				label.set_fontsize(8)
+			radio.on_clicked(callback)
+			self.widgets.append(radio)
+
+		self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+		self._layout_axes()
+		self.update(full=True)
+
+	def set_root(self, label):
+		self.root = music_theory.CHROMATIC_PREFIXES.index(label)
+		self.update()
+
+	def set_scale(self, label):
+		self.scale = label
+		self.update()
+
+	def set_chord(self, label):
+		chord = ALL_CHORDS if label == ALL_CHORDS else music_theory.CHORD_SUFFIXES[CHORD_LABELS.index(label) - 1]
+		full = (chord == ALL_CHORDS) != (self.chord == ALL_CHORDS)
+		self.chord = chord
+		if full:
+			self._layout_axes()
+		self.update(full)
+
+	def set_axis_style(self, label):
+		self.axis_style = label
+		self._layout_axes()
+		self.update(full=True)
+
+	##	@brief y coordinates of MIDI notes in the current axis style
+	def _y(self, midi):
+		midi = np.asarray(midi, dtype=float)
+		if self.axis_style in ('hz', 'log hz'):
+			index = np.clip(np.nan_to_num(midi, nan=0.0).astype(int) - self.midi_offset, 0, len(self.all_notes) - 1)
+			return np.where(np.isnan(midi), np.nan, self.all_notes[index])
+		return midi
+
+	##	@brief limits, scales and ticks of both axes, which need a full redraw
+	def _layout_axes(self):
+		log = self.axis_style == 'log hz'
+		for ax, (low, high) in [(self.scale_ax, SCALE_RANGE), (self.chord_ax, CHORD_RANGE)]:
+			ax.set_yscale('log' if log else 'linear')
+			ax.set_ylim(self._y(low), self._y(high))
+			if self.axis_style == 'hz' or log:
+				ticks = self._y(np.arange(low, high + 1, 2 if log else 4))
+				ax.set_yticks(ticks)
+				ax.set_yticklabels(['%.0f' % tick for tick in ticks])
+				ax.set_ylabel('Frequency (%s)' % ('logarithmic hz' if log else 'hz'))
+			elif self.axis_style == 'semitones':
+				ticks = np.arange(low, high + 1, 2)
+				ax.set_yticks(ticks)
+				ax.set_yticklabels([str(tick - MIDDLE_C) for tick in ticks])
+				ax.set_ylabel('Semitones above C4')
+			else:
+				ticks = np.arange(low, high + 1)
+				ax.set_yticks(ticks)
+				ax.set_yticklabels(music_theory.midi_note_names(ticks), fontsize=7)
+				ax.set_ylabel('Note Name')
+			ax.minorticks_off()
+			ax.grid(True)
+
+		self.scale_ax.set_xlim(-0.5, 12.5)
+		self.scale_ax.set_xticks(np.arange(13))
+		self.scale_ax.set_xticklabels([str(degree) for degree in range(1, 14)])
+		self.scale_ax.set_xlabel('Scale degree')
+		if self.chord == ALL_CHORDS:
+			chords = len(self.catalog.chord_names)
+			self.chord_ax.set_xlim(-1, chords)
+			self.chord_ax.set_xticks(np.arange(0, chords, len(music_theory.CHORD_SUFFIXES)))
+			self.chord_ax.set_xticklabels(music_theory.CHROMATIC_PREFIXES)
+			self.chord_ax.set_xlabel('All chords, by root')
+		else:
+			self.chord_ax.set_xlim(-0.5, 11.5)
+			self.chord_ax.set_xticks(np.arange(12))
+			self.chord_ax.set_xticklabels(DEGREE_NAMES)
+			self.chord_ax.set_xlabel('Chord on each scale degree')
+
+	##	@brief data of every artist for the current selection
+	def _update_artists(self):
+		semitones = music_theory.calc_scale_semitones(self.scale)
+		scale_midi = MIDDLE_C + self.root + semitones
+		scale_y = self._y(scale_midi)
+		self.scale_line.set_data(np.arange(len(scale_midi)), scale_y)
+		names = music_theory.midi_note_names(scale_midi)
+		for i, text in enumerate(self.note_texts):
+			text.set_text(names[i] if i < len(names) else '')
+			text.set_position((i, scale_y[min(i, len(scale_y) - 1)]))
+		steps = music_theory.step_names(self.all_notes[scale_midi - self.midi_offset])
+		for i, text in enumerate(self.step_texts):
+			text.set_text(steps[i] if i < len(steps) else '')
+			text.set_position((i + 0.5, scale_y[min(i, len(scale_y) - 1)]))
+		self.scale_ax.set_title('%s %s' % (music_theory.CHROMATIC_PREFIXES[self.root], self.scale))
+
+		# chord intervals of the selection, as (chords, max notes) MIDI notes
+		intervals = music_theory.CHORD_TABLE.astype(float)
+		intervals[~music_theory.CHORD_MASK] = np.nan
+		if self.chord == ALL_CHORDS:
+			roots = np.repeat(np.arange(12), len(music_theory.CHORD_SUFFIXES))
+			chord_midi = MIDDLE_C + roots[:,np.newaxis] + np.tile(intervals, (12, 1))
+			labels = []
+			self.chord_ax.set_title('All chords')
+		else:
+			roots = (self.root + semitones[:-1]) % 12
+			chord_midi = MIDDLE_C + roots[:,np.newaxis] + intervals[music_theory.CHORD_SUFFIXES.index(self.chord)]
+			labels = [music_theory.CHROMATIC_PREFIXES[root] + self.chord for root in roots]
+			self.chord_ax.set_title("%s chords of %s %s" % (CHORD_LABELS[music_theory.CHORD_SUFFIXES.index(self.chord) + 1],
+				music_theory.CHROMATIC_PREFIXES[self.root], self.scale))
+
+		chord_y = self._y(chord_midi)
+		valid = ~np.isnan(chord_y)
+		x = np.broadcast_to(np.arange(len(chord_y))[:,np.newaxis], chord_y.shape)
+		self.chord_scatter.set_offsets(np.column_stack([x[valid], chord_y[valid]]))
+		self.chord_scatter.set_facecolors(self.cycle[np.nonzero(valid)[1] % len(self.cycle)])
+		lows, highs = np.nanmin(chord_y, axis=1), np.nanmax(chord_y, axis=1)
+		self.chord_lines.set_segments(np.stack([np.column_stack([x[:,0], lows]), np.column_stack([x[:,0], highs])], axis=1))
+		for i, text in enumerate(self.chord_texts):
+			text.set_text(labels[i] if i < len(labels) else '')
+			text.set_position((i, highs[i] if i < len(labels) else 0.0))
+
+	def _animated(self):
+		return ([self.scale_line, self.chord_lines, self.chord_scatter, self.scale_ax.title, self.chord_ax.title]
+			+ self.note_texts + self.step_texts + self.chord_texts)
+
+	##	@brief cache the background without the animated artists, then draw them on top
+	def _on_draw(self, event):
+		self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+		self._blit()
+
+	def _blit(self):
+		for artist in self._animated():
+			artist.axes.draw_artist(artist)
+		self.fig.canvas.blit(self.fig.bbox)
+
+	##	@brief apply the current selection
+	#		@param full redraw the whole figure, needed after the axes changed
+	def update(self, full=False):
+		self._update_artists()
+		if full or self.background is None:
+			self.fig.canvas.draw()
+			return
+		self.fig.canvas.restore_region(self.background)
+		self._blit()
+		self.fig.canvas.flush_events()
+
+	def show(self):
+		import matplotlib.pyplot as plt
+		plt.show()
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='explore scales, modes and chords in one window')
+	parser.add_argument('--tuning', choices=sorted(music_theory.TUNINGS), default='A440', help='reference pitch')
+	args = parser.parse_args(argv)
+	MusicExplorer(args.tuning).show()
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,877 @@
+#!/usr/bin/env python
+
+## @file music_theory.py
+#	 @brief notes, chords and scales as numbers
+#
+#	 pitch tables, note names, chord catalogs and chord identification used by
+#	 plot_musical_notes.  only needs numpy, so it can be imported by workers and
+#	 short-lived scripts without loading matplotlib.  see the notes at the top of
+#	 plot_musical_notes.py for the music theory behind the tables.
+#
+#	 @author eric victorson
+#  @date 2019_01_01
+import functools
+import hashlib
+import os
+import shutil
+import tempfile
+import types
+
+import numpy as np
+
+import stage_profile
+
+# pitch class names, in semitones above C
+CHROMATIC_PREFIXES = ['C','Cs','D','Ds','E','F','Fs','G','Gs','A','As','B']
+
+# steps of the major scale in semitones, the modes are its rotations
+MAJOR_STEPS = [2, 2, 1, 2, 2, 2, 1]
+MODES = ['ionian', 'dorian', 'phrygian', 'lydian', 'mixolydian', 'aeolian', 'locrian']
+
+# scales as the semitone steps of one octave, see calc_scale_semitones
+SCALE_STEPS = dict((mode, MAJOR_STEPS[i:] + MAJOR_STEPS[:i]) for i, mode in enumerate(MODES))
+SCALE_STEPS.update([
+	('harmonic minor', [2, 1, 2, 2, 1, 3, 1]),
+	('melodic minor', [2, 1, 2, 2, 2, 2, 1]),		# ascending
+	('major pentatonic', [2, 2, 3, 2, 3]),
+	('minor pentatonic', [3, 2, 2, 3, 2]),
+	('blues', [3, 2, 1, 1, 3, 2]),
+	('whole tone', [2, 2, 2, 2, 2, 2]),
+	('octatonic', [2, 1, 2, 1, 2, 1, 2, 1]),		# whole-half diminished
+	('chromatic', [1] * 12),
+])
+SCALES = list(SCALE_STEPS)
+
+# MIDI note number of frequencies that are no note, see quantize_frequencies
+NO_NOTE = -1
+
+# octaves -1 through 10 in scientific pitch notation
+DEFAULT_OCTAVES = np.arange(-1, 11)
+
+# reference pitches as (note name, frequency in hz)
+TUNINGS = {
+	'A440': ('A4', 440.0),				# ISO 16 concert pitch
+	'A442': ('A4', 442.0),				# common european orchestral pitch
+	'A432': ('A4', 432.0),
+	'scientific': ('C4', 256.0),	# verdi tuning / philosophical pitch, all Cs are powers of 2
+}
+
+# pure fifth (3/2), and the quarter-comma meantone fifth, narrowed by 1/4 syntonic comma (81/80)
+PERFECT_FIFTH_CENTS = 1200.0 * np.log2(3.0 / 2.0)
+MEANTONE_FIFTH_CENTS = PERFECT_FIFTH_CENTS - 1200.0 * np.log2(81.0 / 80.0) / 4.0
+
+# 5-limit just intonation ratios of the 12 pitch classes above the tonic
+JUST_RATIOS = [1.0, 16/15., 9/8., 6/5., 5/4., 4/3., 45/32., 3/2., 8/5., 5/3., 9/5., 15/8.]
+
+##	@brief cents of the 12 pitch classes above the tonic, for a chain of equal fifths
+#		@param fifth_cents size of the fifth in cents
+#		@param lowest fifths below the tonic in the chain, -3 spans Eb - Gs
+#		@return tuple of 12 cents, pitch class 0 (the tonic) first
+def calc_fifths_cents(fifth_cents, lowest=-3):
+	fifths = np.arange(lowest, lowest + 12)
+	order = np.argsort(fifths * 7 % 12)
+	return tuple(np.mod(fifths * fifth_cents, 1200.0)[order].tolist())
+
+# temperaments as cents of the 12 pitch classes above the tonic, see temperament_cents
+TEMPERAMENTS = {
+	'equal': tuple(np.arange(12) * 100.0),
+	'just': tuple((1200.0 * np.log2(JUST_RATIOS)).tolist()),
+	'pythagorean': calc_fifths_cents(PERFECT_FIFTH_CENTS),
+	'meantone': calc_fifths_cents(MEANTONE_FIFTH_CENTS),	# quarter-comma, pure major thirds
+}
+
+# sethares' fit of the plomp-levelt dissonance curve of two sine partials, see calc_dissonance
+DISSONANCE_B1 = 3.5
+DISSONANCE_B2 = 5.75
+DISSONANCE_DSTAR = 0.24
+DISSONANCE_S1 = 0.0207
+DISSONANCE_S2 = 18.96
+
+# harmonics per note, and the amplitude of each harmonic relative to the one below it
+DISSONANCE_HARMONICS = 6
+DISSONANCE_ROLLOFF = 0.88
+
+# partial pairs scored per batch, bounds the temporary arrays to a few tens of MB
+DISSONANCE_CHUNK_PAIRS = 1 << 19
+
+# intervals in number of semitones
+# interval        semitones
+ROOT 							= 0
+MINOR_SECOND 			= 1
+MAJOR_SECOND 			= 2
+MINOR_THIRD 			= 3
+MAJOR_THIRD 			= 4
+PERFECT_FOURTH 		= 5
+DIMINISHED_FIFTH 	= 6
+PERFECT_FIFTH 		= 7
+MINOR_SIXTH 			= 8
+MAJOR_SIXTH 			= 9
+MINOR_SEVENTH 		= 10
+MAJOR_SEVENTH 		= 11
+PERFECT_OCTAVE 		= 12
+MINOR_NINTH 			= 13
+MAJOR_NINTH 			= 14
+MINOR_TENTH 			= 15
+MAJOR_TENTH 			= 16
+ELEVENTH 					= 17
+THIRTEENTH 				= 21
+
+# chord name suffixes, in the same order as CHORD_INTERVALS
+CHORD_SUFFIXES = [' ','m','7','m7','maj7','6','m6','6/9','5','9','m9','maj9',
+									'11','m11','13','m13','add9','add2','7-5','7+5','sus4','sus2',
+									'dim','m7b5','aug']
+
+# chord intervals
+CHORD_INTERVALS = [
+	[ROOT, MAJOR_THIRD, PERFECT_FIFTH],																											# C
+	[ROOT, MINOR_THIRD, PERFECT_FIFTH],																											# Cm
+	[ROOT, MAJOR_THIRD, PERFECT_FIFTH, MINOR_SEVENTH],																			# C7
+	[ROOT, MINOR_THIRD, PERFECT_FIFTH, MINOR_SEVENTH],																			# Cm7
+	[ROOT, MAJOR_THIRD, PERFECT_FIFTH, MAJOR_SEVENTH],																			# Cmaj7
+	[ROOT, MAJOR_THIRD, PERFECT_FIFTH, MAJOR_SIXTH],																				# C6
+	[ROOT, MINOR_THIRD, PERFECT_FIFTH, MAJOR_SIXTH],																				# Cm6
+	[ROOT, MAJOR_THIRD, PERFECT_FIFTH, MAJOR_SIXTH, MAJOR_NINTH],														# C6/9 / C6add9
+	[ROOT, PERFECT_FIFTH],																																	# C5
+	[ROOT, MAJOR_THIRD, PERFECT_FIFTH, MINOR_SEVENTH, MAJOR_NINTH],													# C9
+	[ROOT, MINOR_THIRD, PERFECT_FIFTH, MINOR_SEVENTH, MAJOR_NINTH],													# Cm9
+	[ROOT, MAJOR_THIRD, PERFECT_FIFTH, MAJOR_SEVENTH, MAJOR_NINTH],													# Cmaj9
+	[ROOT, MAJOR_THIRD, PERFECT_FIFTH, MINOR_SEVENTH, MAJOR_NINTH, ELEVENTH],								# C11
+	[ROOT, MINOR_THIRD, PERFECT_FIFTH, MINOR_SEVENTH, MAJOR_NINTH, ELEVENTH],								# Cm11
+	[ROOT, MAJOR_THIRD, PERFECT_FIFTH, MINOR_SEVENTH, MAJOR_NINTH, ELEVENTH, THIRTEENTH],		# C13
+	[ROOT, MINOR_THIRD, PERFECT_FIFTH, MINOR_SEVENTH, MAJOR_NINTH, ELEVENTH, THIRTEENTH],		# Cm13
+	[ROOT, MAJOR_THIRD, PERFECT_FIFTH, MAJOR_NINTH],																				# Cadd9
+	[ROOT, MAJOR_SECOND, MAJOR_THIRD, PERFECT_FIFTH],																			# Cadd2
+	[ROOT, MAJOR_THIRD, DIMINISHED_FIFTH, MINOR_SEVENTH],																	# C7-5
+	[ROOT, MAJOR_THIRD, MINOR_SIXTH, MINOR_SEVENTH],																				# C7+5
+	[ROOT, PERFECT_FOURTH, PERFECT_FIFTH],																									# Csus4
+	[ROOT, MAJOR_SECOND, PERFECT_FIFTH],																										# Csus2
+	[ROOT, MINOR_THIRD, DIMINISHED_FIFTH],																									# Cdim
+	[ROOT, MINOR_THIRD, DIMINISHED_FIFTH, MINOR_SEVENTH],																	# Cm7b5
+	[ROOT, MAJOR_THIRD, MINOR_SIXTH],																											# Caug
+]
+
+# number of tunings / octave ranges to keep built chord catalogs for
+CHORD_CATALOG_CACHE_SIZE = 8
+
+# on-disk table cache, see get_chord_catalog.  bump the version when the table layout changes
+TABLE_CACHE_VERSION = 1
+TABLE_CACHE_ENV = 'MUSIC_PLOTS_CACHE_DIR'
+TABLE_NAMES = ['note_names', 'all_notes', 'chord_freq_table', 'chord_mask', 'chord_intervals', 'interval_mask']
+
+## @brief ChordCatalog all chords for one tuning and octave range, built once
+#
+#	 note names, the pitch table and the frequencies of all 12 roots x 25 chord types are
+#	 computed in the constructor, the roots in the octave of the range closest to middle c, or taken from tables loaded from the on-disk cache.
+#	 Lookups by chord name and the 'c' and 'all' views are then plain dictionary reads,
+#	 built on first use.  Catalogs are shared through get_chord_catalog, so the views
+#	 are read-only.
+class ChordCatalog(object):
+
+	##	@brief build the catalog
+	#		@param tuning name of a tuning in TUNINGS, or a (note name, frequency) reference pair
+	#		@param octaves octave numbers of the pitch table
+	#		@param temperament name in TEMPERAMENTS or 12 cents, tuned with C as the tonic
+	#		@param tables arrays named in TABLE_NAMES from an earlier catalog, computed if None
+	@stage_profile.stage('music_theory.ChordCatalog')
+	def __init__(self, tuning='A440', octaves=DEFAULT_OCTAVES, temperament='equal', tables=None):
+		self.tuning = tuning
+		self.octaves = tuple(octaves)
+		self.temperament = temperament
+		if not self.octaves:
+			raise ValueError("a chord catalog needs at least one octave")
+
+		self.chord_names = combine_prefix_suffix(CHROMATIC_PREFIXES, CHORD_SUFFIXES, 'suffixes_first')
+		self.c_chord_names = combine_prefix_suffix(['C'], CHORD_SUFFIXES, 'suffixes_first')
+
+		# roots for the chord names are the middle c chromatic scale, C4 - B4, or the octave of
+		# the range closest to it
+		self.root_octave = min(self.octaves, key=lambda octave: abs(octave - 4))
+		self.root_names = calc_note_names(CHROMATIC_PREFIXES, [self.root_octave])
+
+		# scale degrees
+		#root_note = 'C4'	# I
+		#root_note = 'D4'	# II
+		#root_note = 'E4'	# III
+		#root_note = 'F4'	# IV
+		#root_note = 'G4'	# V
+		#root_note = 'A4'	# VI
+		#root_note = 'B4' # VII
+		#root_note = 'C5' # VIII
+
+		if tables is not None:
+			self.note_names = tables['note_names']
+			self.all_notes = tables['all_notes']
+			self.chord_freq_table = tables['chord_freq_table']
+			self.chord_mask = tables['chord_mask']
+			return
+
+		# note: standard 88 key piano range is A0 - C8
+		self.note_names = calc_note_names(CHROMATIC_PREFIXES, self.octaves)
+
+		# 0 C,, 		sub-contra octave C0		marks the low end of human hearing, only A0, B0 keys on piano
+		# 1 C, 			contra octave C1
+		#	2 C 			great octave	C2
+		# 3 c 			small octave	C3
+		# 4 c' 			1-line octave (middle c)						C4
+		# 5 c" 			2-line octave (tenor c)							C5
+		# 6 c"' 		3-line octave (soprano c (high c))	C6
+		# 7 c"" 		4-line octave (double high c)				C7
+		# 8 c""' 		5-line octave (eighth octave)				C8
+
+		# calculate all possible notes of chromatic scale from the tuning reference pitch
+		self.all_notes = calc_pitch_table(self.octaves, tuning=tuning, temperament=temperament).ravel()
+
+		# all roots x chord types in one batch
+		self.chord_freq_table, self.chord_mask = self.calc_chord_table(self.root_names)
+
+	##	@brief the arrays of the catalog, as saved in the on-disk cache
+	#		@return dictionary of the arrays named in TABLE_NAMES
+	def tables(self):
+		return {
+			'note_names': np.asarray(self.note_names),
+			'all_notes': np.asarray(self.all_notes),
+			'chord_freq_table': self.chord_freq_table,
+			'chord_mask': self.chord_mask,
+			'chord_intervals': CHORD_TABLE,
+			'interval_mask': CHORD_MASK,
+		}
+
+	@functools.cached_property
+	def note_index(self):
+		return calc_note_index(self.note_names)
+
+	@functools.cached_property
+	def notes_dict(self):
+		return dict(zip(self.note_names, self.all_notes))
+
+	@functools.cached_property
+	def chord_rows(self):
+		return calc_note_index(self.chord_names)
+
+	@functools.cached_property
+	def chord_dict(self):
+		# split the padded rows into per chord lists
+		chord_frequencies = [freqs[:length].tolist() for freqs, length in
+			zip(self.chord_freq_table.reshape(-1, CHORD_TABLE.shape[1]), self.chord_mask.sum(axis=-1).ravel())]
+		return types.MappingProxyType(dict(zip(self.chord_names, chord_frequencies)))
+
+	@functools.cached_property
+	def c_chord_dict(self):
+		return types.MappingProxyType(dict((name, self.chord_dict[name]) for name in self.c_chord_names))
+
+	##	@brief padded frequencies of a list of chords, such as a progression
+	#		@param chord_names chord names, such as ['C ','G ','Am','F ']
+	#		@return array of shape (chords, max notes per chord), nan after the last note of each chord
+	def get_chord_table(self, chord_names):
+		rows = [self.chord_rows[name] for name in chord_names]
+		return self.chord_freq_table.reshape(-1, CHORD_TABLE.shape[1])[rows]
+
+	##	@brief frequencies of every chord type on any set of roots, such as all 88 piano keys
+	#		@param root_notes root note names, such as ['C4','Cs4'] or calc_note_names(CHROMATIC_PREFIXES, range(0, 9))
+	#		@return (freqs, mask) arrays of shape (roots, chord types, max notes per chord), see calc_chord_freq_table
+	def calc_chord_table(self, root_notes):
+		root_indices = np.array([self.note_index[name] for name in root_notes], dtype=np.intp)
+		return calc_chord_freq_table(CHORD_TABLE, CHORD_MASK, root_indices, self.all_notes)
+
+	##	@brief notes of a scale by name
+	#		@param scale name in SCALES, or a sequence of steps, see scale_steps
+	#		@param root pitch class name of the tonic, such as 'C' or 'Fs'
+	#		@param octave octave of the tonic
+	#		@param degrees scale degrees, see calc_scale_semitones, defaults to one octave
+	#		@return (frequencies, note names) arrays
+	def scale_notes(self, scale, root='C', octave=4, degrees=None):
+		index = (octave - self.octaves[0]) * 12 + CHROMATIC_PREFIXES.index(root) + calc_scale_semitones(scale, degrees)
+		if index.min() < 0 or index.max() >= len(self.all_notes):
+			raise ValueError("%s %s%d reaches outside octaves %d - %d" % (scale, root, octave, self.octaves[0], self.octaves[-1]))
+		return np.asarray(self.all_notes)[index], np.asarray(self.note_names)[index].tolist()
+
+	##	@brief look up the frequencies of a chord by name, such as 'Cm7'
+	def __getitem__(self, chord_name):
+		return self.chord_dict[chord_name]
+
+	def __contains__(self, chord_name):
+		return chord_name in self.chord_dict
+
+	def __len__(self):
+		return len(self.chord_dict)
+
+	##	@brief ready-made chord dictionary for a range
+	#		@param range 'c' for the C chords only, or 'all'
+	#		@return read-only dictionary of chord name -> list of pitches in the chord
+	def view(self, range):
+		if range == 'c':
+			return self.c_chord_dict
+		if range == 'all':
+			return self.chord_dict
+		raise ValueError("unknown chord range: %s" % range)
+
+	##	@brief catalog name of a chord written without the trailing space of major triads
+	#		@param chord_name chord name, such as 'C', 'C ' or 'Am7'
+	#		@return chord name as used by the catalog, such as 'C '
+	def resolve_name(self, chord_name):
+		if chord_name in self.chord_rows:
+			return chord_name
+		if chord_name + ' ' in self.chord_rows:
+			return chord_name + ' '
+		raise KeyError("unknown chord: %r" % chord_name)
+
+##	@brief directory name of the cached tables of a catalog
+#		@param tuning name of a tuning in TUNINGS, or a (note name, frequency) reference pair
+#		@param octaves tuple of octave numbers
+#		@param temperament name in TEMPERAMENTS or 12 cents
+#		@return name unique to the cache version, reference pitch, temperament, octaves and chord vocabulary
+def table_cache_key(tuning, octaves, temperament='equal'):
+	ref_note, ref_freq = TUNINGS[tuning] if isinstance(tuning, str) else tuning
+	cents = tuple(temperament_cents(temperament).tolist())
+	params = repr((ref_note, float(ref_freq), cents, tuple(octaves), CHORD_SUFFIXES, CHORD_INTERVALS))
+	return 'tables-v%d-%s%g-%s-%d_%d-%s' % (TABLE_CACHE_VERSION, ref_note, ref_freq,
+		temperament if isinstance(temperament, str) else 'custom',
+		min(octaves), max(octaves), hashlib.sha1(params.encode()).hexdigest()[:12])
+
+##	@brief save catalog tables as .npy files that can be memory-mapped
+#		the files are written to a temporary directory and renamed into place, so readers never
+#		see a partial cache and concurrent writers do not clash
+#		@param path cache directory of the tables, from table_cache_key
+#		@param tables dictionary of arrays, such as ChordCatalog.tables()
+def save_tables(path, tables):
+	parent = os.path.dirname(os.path.abspath(path))
+	os.makedirs(parent, exist_ok=True)
+	tmp = tempfile.mkdtemp(dir=parent, prefix='.tmp-')
+	try:
+		for name, array in tables.items():
+			np.save(os.path.join(tmp, name + '.npy'), np.ascontiguousarray(array))
+		with open(os.path.join(tmp, 'version'), 'w') as f:
+			f.write('%d\n' % TABLE_CACHE_VERSION)
+		os.rename(tmp, path)
+	except OSError:
+		# another process saved the same tables first
+		shutil.rmtree(tmp, ignore_errors=True)
+		if not os.path.isdir(path):
+			raise
+
+##	@brief memory-map cached tables without copying them
+#		@param path cache directory of the tables, from table_cache_key
+#		@return dictionary of read-only memmaps named in TABLE_NAMES, or None if not cached
+def load_tables(path):
+	try:
+		with open(os.path.join(path, 'version')) as f:
+			if int(f.read()) != TABLE_CACHE_VERSION:
+				return None
+		return dict((name, np.load(os.path.join(path, name + '.npy'), mmap_mode='r')) for name in TABLE_NAMES)
+	except (OSError, ValueError):
+		return None
+
+@functools.lru_cache(maxsize=CHORD_CATALOG_CACHE_SIZE)
+def _cached_chord_catalog(tuning, octaves, cache_dir=None, temperament='equal'):
+	if cache_dir is None:
+		return ChordCatalog(tuning, octaves, temperament)
+	path = os.path.join(cache_dir, table_cache_key(tuning, octaves, temperament))
+	tables = load_tables(path)
+	if tables is not None:
+		return ChordCatalog(tuning, octaves, temperament, tables)
+	catalog = ChordCatalog(tuning, octaves, temperament)
+	save_tables(path, catalog.tables())
+	return catalog
+
+##	@brief get the chord catalog for a tuning and octave range, building it on first use
+#		@param tuning name of a tuning in TUNINGS, or a (note name, frequency) reference pair
+#		@param octaves octave numbers of the pitch table
+#		@param cache_dir directory of the on-disk table cache, defaults to the MUSIC_PLOTS_CACHE_DIR
+#			environment variable.  tables found there are memory-mapped instead of computed, new ones
+#			are saved.  without either, nothing is written to disk
+#		@param temperament name in TEMPERAMENTS or 12 cents, see temperament_cents
+#		@return shared ChordCatalog, the least recently used catalogs are evicted
+@stage_profile.stage()
+def get_chord_catalog(tuning='A440', octaves=DEFAULT_OCTAVES, cache_dir=None, temperament='equal'):
+	if not isinstance(tuning, str):
+		tuning = tuple(tuning)
+	if not isinstance(temperament, str):
+		temperament = tuple(float(cents) for cents in temperament)
+	if cache_dir is None:
+		cache_dir = os.environ.get(TABLE_CACHE_ENV) or None
+	return _cached_chord_catalog(tuning, tuple(int(octave) for octave in octaves), cache_dir, temperament)
+
+## @brief chords generate chords
+#	 @param range individual range, such as C, or all
+#	 @param tuning name of a tuning in TUNINGS, or a (note name, frequency) reference pair
+#	 @return chord_dict dictionary of chords, where keys are chord name, and values are lists of pitches in the chord
+@stage_profile.stage()
+def chords(range, tuning='A440'):
+	return get_chord_catalog(tuning).view(range)
+
+##	@brief pad chord interval lists into a single array
+#		@param chord_intervals list of lists of intervals in semitones, such as CHORD_INTERVALS
+#		@return (intervals, mask) int arrays of shape (chords, max notes per chord), mask is True for real notes
+def pad_chord_intervals(chord_intervals):
+	lengths = np.array([len(chord) for chord in chord_intervals])
+	mask = np.arange(lengths.max())[np.newaxis,:] < lengths[:,np.newaxis]
+	intervals = np.zeros(mask.shape, dtype=np.intp)
+	intervals[mask] = np.concatenate(chord_intervals)
+	return intervals, mask
+
+CHORD_TABLE, CHORD_MASK = pad_chord_intervals(CHORD_INTERVALS)
+
+##	@brief map note names to their position in the pitch table
+#		@param note_names note names, octave by octave, as returned by calc_note_names
+#		@return dictionary of note name -> index into all_notes
+def calc_note_index(note_names):
+	return dict(zip(note_names, range(len(note_names))))
+
+##	@brief calculate the frequencies of every chord on every root with one fancy indexing operation
+#		@param intervals padded interval array of shape (chords, max notes), as returned by pad_chord_intervals
+#		@param mask note mask of shape (chords, max notes)
+#		@param root_indices positions of the root notes in all_notes
+#		@param all_notes flat pitch table
+#		@return (freqs, mask) arrays of shape (roots, chords, max notes).  padding and notes above the
+#			top of the pitch table are nan in freqs and False in mask
+@stage_profile.stage()
+def calc_chord_freq_table(intervals, mask, root_indices, all_notes):
+	all_notes = np.asarray(all_notes, dtype=float)
+	note_indices = np.asarray(root_indices)[:,np.newaxis,np.newaxis] + intervals[np.newaxis,:,:]
+	valid = mask[np.newaxis,:,:] & (note_indices < len(all_notes))
+	freqs = np.where(valid, all_notes[np.minimum(note_indices, len(all_notes) - 1)], np.nan)
+	return freqs, valid
+
+# pass in all chord names, intervals, the name of the root note, and the notes - freq dictionary
+# return chord frequencies
+@stage_profile.stage()
+def calc_chord_freqs(chord_names, chord_intervals, root_note, notes_dict, all_notes, note_index=None):
+	# position of the root note in the all_notes list, notes_dict is built in the same order as all_notes
+	if note_index is None:
+		note_index = calc_note_index(notes_dict)
+	pos = note_index[root_note]
+
+	# take the position of the frequency in the all_notes list and calculate what frequencies
+	# are present in the chord given the intervals present in the chord
+	intervals, mask = pad_chord_intervals(chord_intervals)
+	freqs, mask = calc_chord_freq_table(intervals, mask, [pos], all_notes)
+
+	# the chord_frequencies list should now contain a list of all frequencies present for each chord
+	return [chord_freq[chord_mask].tolist() for chord_freq, chord_mask in zip(freqs[0], mask[0])]
+
+##	@brief intervals of every inversion of padded chords, the notes below the new bass moved up by octaves
+#		@param intervals padded chord intervals, such as CHORD_TABLE
+#		@param mask True for real notes, such as CHORD_MASK
+#		@return (intervals, mask) arrays of shape (chords, inversions, max notes), inversion 0 is root
+#			position, intervals stay relative to the chord root and ascend, such as [4, 7, 12] for a first
+#			inversion major triad or [14, 16, 19, 22, 24] for the fourth inversion of a ninth chord.
+#			inversions past the number of notes of a chord are False in mask
+def calc_inversion_intervals(intervals, mask):
+	intervals = np.asarray(intervals)
+	counts = np.asarray(mask).sum(axis=1)[:,np.newaxis,np.newaxis]
+	width = intervals.shape[1]
+	inversion = np.arange(width)[np.newaxis,:,np.newaxis]
+	position = np.arange(width)[np.newaxis,np.newaxis,:]
+
+	# note i of inversion k is note i + k of the chord, the notes wrapped around lifted by as many
+	# octaves as it takes to sit above the new bass, which matters for 9ths, 11ths and 13ths
+	source = position + inversion
+	wrapped = source >= counts
+	source = np.minimum(np.where(wrapped, source - counts, source), width - 1)
+	rotated = np.take_along_axis(np.broadcast_to(intervals[:,np.newaxis,:], source.shape), source, axis=2)
+	bass = rotated[:,:,:1]
+	rotated = rotated + PERFECT_OCTAVE * np.where(wrapped, (bass - rotated) // PERFECT_OCTAVE + 1, 0)
+	valid = (position < counts) & (inversion < counts)
+	rotated = np.sort(np.where(valid, rotated, np.iinfo(rotated.dtype).max), axis=2)
+	return np.where(valid, rotated, 0), valid
+
+##	@brief psychoacoustic roughness of chords, summed over all pairs of partials of their notes
+#		every note has harmonics partials with amplitudes 1, rolloff, rolloff**2, ...  two partials at
+#		f1 < f2 with amplitudes a1, a2 add min(a1, a2) * (exp(-b1 s (f2 - f1)) - exp(-b2 s (f2 - f1))),
+#		s = dstar / (s1 f1 + s2), the plomp-levelt curve as fit by sethares
+#		@param freqs chord frequencies along the last axis, nan for padding, any leading shape
+#		@param harmonics partials per note
+#		@param rolloff amplitude ratio of successive harmonics
+#		@param chunk_pairs partial pairs scored per batch
+#		@return float array of scores with the leading shape of freqs, 0 for single notes
+def calc_dissonance(freqs, harmonics=DISSONANCE_HARMONICS, rolloff=DISSONANCE_ROLLOFF, chunk_pairs=DISSONANCE_CHUNK_PAIRS):
+	freqs = np.asarray(freqs, dtype=float)
+	shape = freqs.shape[:-1]
+	freqs = freqs.reshape(-1, freqs.shape[-1])
+
+	# (chords, notes x harmonics) partials, padding gets zero amplitude
+	numbers = np.arange(1, harmonics + 1)
+	partials = (freqs[:,:,np.newaxis] * numbers).reshape(len(freqs), -1)
+	amplitudes = np.where(np.isnan(partials), 0.0, np.tile(rolloff ** (numbers - 1.0), freqs.shape[1]))
+	partials = np.nan_to_num(partials)
+
+	first, second = np.triu_indices(partials.shape[1], 1)
+	scores = np.empty(len(freqs))
+	rows = max(1, chunk_pairs // max(1, len(first)))
+	for start in range(0, len(freqs), rows):
+		f1 = partials[start:start + rows, first]
+		f2 = partials[start:start + rows, second]
+		spread = DISSONANCE_DSTAR / (DISSONANCE_S1 * np.minimum(f1, f2) + DISSONANCE_S2) * np.abs(f2 - f1)
+		loudness = np.minimum(amplitudes[start:start + rows, first], amplitudes[start:start + rows, second])
+		scores[start:start + rows] = (loudness * (np.exp(-DISSONANCE_B1 * spread) - np.exp(-DISSONANCE_B2 * spread))).sum(axis=1)
+	return scores.reshape(shape)
+
+##	@brief dissonance of every chord type in every inversion on every root of a catalog
+#		@param catalog ChordCatalog whose pitch table is used, defaults to get_chord_catalog()
+#		@param root_notes root note names, defaults to the C4 - B4 roots of the catalog chords
+#		@param harmonics partials per note, see calc_dissonance
+#		@return float array of shape (roots, chord types, inversions), nan for inversions a chord
+#			does not have and for voicings reaching above the pitch table
+def calc_chord_dissonance(catalog=None, root_notes=None, harmonics=DISSONANCE_HARMONICS):
+	if catalog is None:
+		catalog = get_chord_catalog()
+	if root_notes is None:
+		root_notes = catalog.root_names
+	intervals, mask = calc_inversion_intervals(CHORD_TABLE, CHORD_MASK)
+	root_indices = np.array([catalog.note_index[name] for name in root_notes], dtype=np.intp)
+	freqs, valid = calc_chord_freq_table(intervals.reshape(-1, intervals.shape[2]), mask.reshape(-1, mask.shape[2]),
+		root_indices, catalog.all_notes)
+	scores = calc_dissonance(freqs, harmonics).reshape(len(root_indices), *mask.shape[:2])
+	complete = (valid == mask.reshape(-1, mask.shape[2])).all(axis=-1).reshape(scores.shape)
+	return np.where(complete & mask.any(axis=2), scores, np.nan)
+
+## @brief NoteQuantization nearest equal tempered notes of an array of frequencies
+#
+#	 midi is the MIDI note number (C-1 = 0, A4 = 69), and cents the deviation of the
+#	 frequency from that note, 1200 * log2(freq / note freq), in [-50, 50).  frequencies that
+#	 are no note, such as the 0 hz of unvoiced frames, get NO_NOTE in midi, pitch_class and
+#	 octave, nan in cents and '' as their name.
+class NoteQuantization(object):
+	__slots__ = ('midi', 'pitch_class', 'octave', 'cents')
+
+	def __init__(self, midi, cents):
+		self.midi = midi
+		none = midi == NO_NOTE
+		self.pitch_class = np.where(none, NO_NOTE, midi % 12)
+		self.octave = np.where(none, NO_NOTE, midi // 12 - 1)
+		self.cents = cents
+
+	##	@brief note names in the CHROMATIC_PREFIXES scheme, such as 'Cs4'
+	#		@return array of str, same shape as midi
+	def names(self):
+		return midi_note_names(self.midi)
+
+##	@brief quantize frequencies to the nearest equal tempered note, closed form over the whole array
+#		@param freqs frequency or array of frequencies in hz
+#		@param tuning name of a tuning in TUNINGS, or a (note name, frequency) reference pair
+#		@return NoteQuantization of arrays with the shape of freqs, NO_NOTE where a frequency is
+#			not positive and finite
+def quantize_frequencies(freqs, tuning='A440'):
+	ref_note, ref_freq = TUNINGS[tuning] if isinstance(tuning, str) else tuning
+	ref_pitch_class, ref_octave = parse_note_name(ref_note)
+	ref_midi = (ref_octave + 1) * 12 + ref_pitch_class
+
+	freqs = np.asarray(freqs, dtype=float)
+	valid = np.isfinite(freqs) & (freqs > 0)
+	with np.errstate(divide='ignore', invalid='ignore'):
+		semitones = np.where(valid, 12.0 * np.log2(freqs / ref_freq), np.nan)
+	nearest = np.floor(semitones + 0.5)
+	midi = np.where(valid, np.nan_to_num(nearest).astype(np.int32) + ref_midi, NO_NOTE)
+	return NoteQuantization(midi, 100.0 * (semitones - nearest))
+
+# names of MIDI notes 0 - 143, C-1 to B10, which are also the notes of DEFAULT_OCTAVES
+@functools.lru_cache(maxsize=1)
+def _midi_name_table():
+	return np.array(calc_note_names(CHROMATIC_PREFIXES, np.arange(-1, 11)))
+
+##	@brief note names of MIDI note numbers
+#		@param midi int array of MIDI note numbers
+#		@return array of str, such as 'A4' for 69, '' for NO_NOTE
+def midi_note_names(midi):
+	table = _midi_name_table()
+	midi = np.asarray(midi)
+	inside = (midi >= 0) & (midi < len(table))
+	if inside.all():
+		return table[midi]
+	names = np.char.add(np.array(CHROMATIC_PREFIXES)[midi % 12], (midi // 12 - 1).astype(str))
+	names = np.where(midi == NO_NOTE, '', names)
+	return np.where(inside, table[np.clip(midi, 0, len(table) - 1)], names)
+
+##	@brief pitch class of a note from its frequency, to the nearest equal tempered semitone
+#		@param freqs frequency or array of frequencies in hz
+#		@param tuning name of a tuning in TUNINGS, or a (note name, frequency) reference pair
+#		@return int array of pitch classes, 0 = C
+def calc_pitch_classes(freqs, tuning='A440'):
+	return quantize_frequencies(freqs, tuning).pitch_class
+
+##	@brief 12 bit pitch class set of one or many note clusters, bit n set for pitch class n
+#		@param pitch_classes pitch classes (or semitones, taken mod 12) along the last axis,
+#			negative entries are padding
+#		@return uint16 mask, scalar for a single cluster or one per row
+def calc_pitch_class_masks(pitch_classes):
+	pitch_classes = np.asarray(pitch_classes)
+	bits = np.where(pitch_classes >= 0, np.left_shift(np.uint16(1), (pitch_classes % 12).astype(np.uint16)), np.uint16(0))
+	return np.bitwise_or.reduce(bits, axis=-1).astype(np.uint16)
+
+## @brief ChordShape compact form of one chord: root pitch class, intervals and pitch class set
+class ChordShape(object):
+	__slots__ = ('name', 'root', 'intervals', 'mask')
+
+	##	@param name chord name, such as 'Cm7'
+	#		@param root pitch class of the root, 0 = C
+	#		@param intervals semitones above the root
+	def __init__(self, name, root, intervals):
+		self.name = name
+		self.root = root
+		self.intervals = np.asarray(intervals, dtype=np.int8)
+		self.mask = int(calc_pitch_class_masks(root + self.intervals))
+
+	##	@brief inversion of the chord with the given bass note
+	#		@param bass_pitch_class pitch class of the lowest note
+	#		@return 0 for root position, 1 for first inversion (third in the bass), ..., None if not in the chord
+	def inversion(self, bass_pitch_class):
+		degrees = ((self.root + self.intervals) % 12).tolist()
+		if bass_pitch_class not in degrees:
+			return None
+		return degrees.index(bass_pitch_class)
+
+	def __repr__(self):
+		return "ChordShape(%r, %d, %s)" % (self.name, self.root, self.intervals.tolist())
+
+## @brief ChordIndex identify chords from note clusters by their pitch class set
+#
+#	 every root x chord type is stored by its 12 bit mask.  because a pitch class set does
+#	 not depend on voicing, all inversions map to the same entry.  some sets are shared by
+#	 several chords (C6 and Am7, Csus4 and Fsus2), those keep every name in catalog order.
+class ChordIndex(object):
+
+	##	@param chord_suffixes chord name suffixes, such as CHORD_SUFFIXES
+	#		@param chord_intervals intervals of each chord type, such as CHORD_INTERVALS
+	def __init__(self, chord_suffixes=CHORD_SUFFIXES, chord_intervals=CHORD_INTERVALS):
+		self.shapes = [ChordShape(prefix + suffix, root, intervals)
+			for root, prefix in enumerate(CHROMATIC_PREFIXES)
+			for suffix, intervals in zip(chord_suffixes, chord_intervals)]
+		self.by_name = dict((shape.name, shape) for shape in self.shapes)
+
+		self.by_mask = {}
+		for shape in self.shapes:
+			self.by_mask.setdefault(shape.mask, []).append(shape)
+
+		# direct table over all 4096 masks for batches, -1 where no chord matches
+		self.lookup = np.full(1 << 12, -1, dtype=np.int16)
+		for chord_id, shape in reversed(list(enumerate(self.shapes))):
+			self.lookup[shape.mask] = chord_id
+
+	##	@brief identify the chord in a cluster of notes
+	#		@param notes note names such as ['E4','G4','C5'], or frequencies in hz
+	#		@param tuning tuning used to read frequencies
+	#		@return list of (chord name, inversion) for every matching chord, the chords with the lowest
+	#			note as root first.  empty if the notes do not form a known chord, or there are none
+	def identify(self, notes, tuning='A440'):
+		if not len(notes):
+			return []
+		if isinstance(notes[0], str):
+			parsed = [parse_note_name(note) for note in notes]
+			pitch_classes = np.array([pitch_class for pitch_class, octave in parsed])
+			bass = min(range(len(parsed)), key=lambda i: (parsed[i][1], parsed[i][0]))
+		else:
+			pitch_classes = calc_pitch_classes(notes, tuning)
+			bass = int(np.argmin(notes))
+		bass_pitch_class = int(pitch_classes[bass])
+		matches = [(shape.name, shape.inversion(bass_pitch_class))
+			for shape in self.by_mask.get(int(calc_pitch_class_masks(pitch_classes)), [])]
+		return sorted(matches, key=lambda match: match[1] != 0)
+
+	##	@brief identify many pitch class sets at once
+	#		@param masks array of 12 bit masks, such as from calc_pitch_class_masks
+	#		@return int array of indices into shapes, -1 where no chord matches
+	def identify_masks(self, masks):
+		return self.lookup[np.asarray(masks, dtype=np.intp)]
+
+@functools.lru_cache(maxsize=1)
+def get_chord_index():
+	return ChordIndex()
+
+##	@brief combine prefixes and suffixes for creating all notes
+#		@param prefixes note or chord prefixes, such as 'A','As','B',...
+#		@param suffixes note or chord suffixes, such as '0','1','2',... or 'm','7','m7','maj7',... etc
+#		@param order dictates if the prefixes should be iterated over first or suffixes
+#		@return combined list
+@stage_profile.stage()
+def combine_prefix_suffix(prefixes, suffixes, order):
+	combined = [];
+	if order == 'prefixes_first':
+		# iterate over all suffixes
+		for suff in suffixes:
+			# iterate over all prefixes
+				for pre in prefixes:
+					combined.append(pre+suff)
+	
+	if order == 'suffixes_first':
+		for pre in prefixes:
+			for suff in suffixes:
+				combined.append(pre+suff)
+
+	return combined
+
+##	@brief calculate octaves
+#		@param input_pitch the input pitch
+#		@param num_octaves the number of octaves above input pitch to calc, scalar or array
+#		@return freq returned octave pitch
+def calc_octave(input_pitch, num_octaves):
+	freq = input_pitch * np.power(2.0,num_octaves)
+	return freq
+
+##	@brief calculate all notes and their corresponding frequencies from an input octave list
+#		@param input_scale input list of notes in a starting octave, usually -1 octave
+#		@param num_octaves number of octaves to calculate, defaults to len(input_scale)
+# 	@return freq_arr	array of all calculated frequencies, octave by octave
+@stage_profile.stage()
+def calc_all_notes(input_scale, num_octaves=None):
+	input_scale = np.asarray(input_scale, dtype=float)
+	if num_octaves is None:
+		num_octaves = len(input_scale)
+	freq_arr = calc_octave(input_scale[np.newaxis,:], np.arange(num_octaves, dtype=float)[:,np.newaxis])
+	return freq_arr.ravel()
+
+##	@brief split a note name such as 'C4', 'Cs-1' or 'A10' into pitch class and octave
+#		@param note_name note name using the CHROMATIC_PREFIXES naming scheme
+#		@return (pitch_class, octave) tuple of ints
+def parse_note_name(note_name):
+	pos = 2 if note_name[1:2] == 's' else 1
+	prefix = note_name[:pos]
+	if prefix not in CHROMATIC_PREFIXES:
+		raise ValueError("unknown note name: %s" % note_name)
+	return CHROMATIC_PREFIXES.index(prefix), int(note_name[pos:])
+
+##	@brief cents of the pitch classes of a temperament
+#		@param temperament name in TEMPERAMENTS, or a user defined sequence of 12 cents above the tonic
+#		@return float array of 12 cents, pitch class 0 (the tonic) first
+def temperament_cents(temperament):
+	if isinstance(temperament, str):
+		if temperament not in TEMPERAMENTS:
+			raise ValueError("unknown temperament: %s" % temperament)
+		temperament = TEMPERAMENTS[temperament]
+	cents = np.asarray(temperament, dtype=float)
+	if cents.shape != (12,):
+		raise ValueError("a temperament needs cents for 12 pitch classes, got shape %s" % (cents.shape,))
+	return cents
+
+##	@brief cents of notes above C-1 in a temperament, the octaves of the temperament's tonic are pure
+#		@param temperaments cents of shape (..., 12), see temperament_cents
+#		@param semitones int array of semitones above C-1, such as MIDI note numbers
+#		@param tonic pitch class the temperament is tuned from
+#		@return float array of shape temperaments.shape[:-1] + semitones.shape
+def calc_note_cents(temperaments, semitones, tonic=0):
+	above_tonic = np.asarray(semitones) - tonic
+	return 1200.0 * (above_tonic // 12) + np.asarray(temperaments)[..., above_tonic % 12] + 100.0 * tonic
+
+##	@brief build the octave x pitch class table of frequencies
+#		@param octaves octave numbers to calculate, such as -1 through 10
+#		@param pitch_classes pitch classes (semitones above C) in each octave, defaults to all 12
+#		@param tuning name of a tuning in TUNINGS, or a (note name, frequency) reference pair
+#		@param temperament name in TEMPERAMENTS, or 12 cents above the tonic, see temperament_cents
+#		@param tonic pitch class the temperament is tuned from, 0 = C
+#		@return pitch_table 2-D array of frequencies, one row per octave
+@stage_profile.stage()
+def calc_pitch_table(octaves=DEFAULT_OCTAVES, pitch_classes=None, tuning='A440', temperament='equal', tonic=0):
+	if pitch_classes is None:
+		pitch_classes = np.arange(12)
+	ref_note, ref_freq = TUNINGS[tuning] if isinstance(tuning, str) else tuning
+	ref_pitch_class, ref_octave = parse_note_name(ref_note)
+
+	# semitones of every note above C-1, in a single broadcast
+	octaves = np.asarray(octaves)
+	pitch_classes = np.asarray(pitch_classes)
+	semitones = (octaves[:,np.newaxis] + 1) * 12 + pitch_classes[np.newaxis,:]
+	ref_semitones = (ref_octave + 1) * 12 + ref_pitch_class
+	if isinstance(temperament, str) and temperament == 'equal':
+		return ref_freq * np.exp2((semitones - ref_semitones) / 12.0)
+
+	# the reference note keeps its frequency, every other note is placed by its cents from it
+	cents = temperament_cents(temperament)
+	offsets = calc_note_cents(cents, semitones, tonic) - calc_note_cents(cents, ref_semitones, tonic)
+	return ref_freq * np.exp2(offsets / 1200.0)
+
+##	@brief cents of every chord note above the chord root, in many temperaments at once
+#		@param temperaments names in TEMPERAMENTS or cents tables, see temperament_cents
+#		@param intervals padded chord intervals, such as CHORD_TABLE
+#		@param mask True for real notes, such as CHORD_MASK
+#		@param roots pitch classes of the chord roots
+#		@param tonic pitch class the temperaments are tuned from
+#		@return float array of shape (temperaments, roots x chords, max notes per chord), root-major
+#			like the chord names of a ChordCatalog, nan after the last note of each chord
+def calc_chord_cents(temperaments, intervals=CHORD_TABLE, mask=CHORD_MASK, roots=None, tonic=0):
+	if roots is None:
+		roots = np.arange(12)
+	tables = np.array([temperament_cents(temperament) for temperament in temperaments])
+	roots = np.asarray(roots)
+	notes = roots[:,np.newaxis,np.newaxis] + np.asarray(intervals)[np.newaxis,:,:]
+	cents = calc_note_cents(tables, notes, tonic) - calc_note_cents(tables, roots, tonic)[:,:,np.newaxis,np.newaxis]
+	cents = np.where(mask, cents, np.nan)
+	return cents.reshape(len(tables), -1, cents.shape[-1])
+
+##	@brief cent deviations of every chord of the catalog between every pair of temperaments
+#		@param temperaments names in TEMPERAMENTS or cents tables, defaults to all of TEMPERAMENTS
+#		@param tonic pitch class the temperaments are tuned from
+#		@return (deviations, names) with deviations of shape (temperaments, temperaments, chords,
+#			max notes per chord), deviations[i, j] = cents in temperament i - cents in temperament j
+#			of each chord note above the chord root, and names the temperaments of the axes
+def calc_cent_deviations(temperaments=None, tonic=0):
+	if temperaments is None:
+		temperaments = sorted(TEMPERAMENTS)
+	cents = calc_chord_cents(temperaments, tonic=tonic)
+	return cents[:,np.newaxis] - cents[np.newaxis,:], list(temperaments)
+
+##	@brief semitone steps of a scale
+#		@param scale name in SCALES, or a user defined sequence of steps in semitones
+#		@return int array of steps, positive and summing to one octave
+def scale_steps(scale):
+	if isinstance(scale, str):
+		if scale not in SCALE_STEPS:
+			raise ValueError("unknown scale: %s" % scale)
+		scale = SCALE_STEPS[scale]
+	steps = np.asarray(scale, dtype=np.intp)
+	if steps.ndim != 1 or not len(steps) or steps.min() < 1 or steps.sum() != 12:
+		raise ValueError("scale steps must be positive semitones adding up to an octave, got %s" % (steps.tolist(),))
+	return steps
+
+##	@brief semitones of scale degrees above the tonic
+#		@param scale name in SCALES, or a sequence of steps, see scale_steps
+#		@param degrees int array of degrees, 0 for the tonic, negative below it and past the octave above it.
+#			defaults to one octave, tonic and octave included
+#		@return int array, such as [0, 2, 4, 5, 7, 9, 11, 12] for ionian
+def calc_scale_semitones(scale, degrees=None):
+	semitones = np.concatenate([[0], np.cumsum(scale_steps(scale))])
+	if degrees is None:
+		return semitones
+	degrees = np.asarray(degrees)
+	notes = len(semitones) - 1
+	return 12 * (degrees // notes) + semitones[degrees % notes]
+
+##	@brief names of the steps between neighbouring notes, T for a whole tone and S for a semitone
+#		@param freqs note frequencies in order
+#		@return array of str, one shorter than freqs, other step sizes as their number of semitones
+def step_names(freqs):
+	freqs = np.asarray(freqs, dtype=float)
+	semitones = np.rint(12.0 * np.log2(freqs[1:] / freqs[:-1])).astype(int)
+	return np.where(semitones == 1, 'S', np.where(semitones == 2, 'T', semitones.astype(str)))
+
+##	@brief one octave of many scales, padded like CHORD_TABLE
+#		@param scales names in SCALES or step sequences, defaults to all of SCALES
+#		@return (semitones, mask) arrays of shape (scales, most notes per octave + 1), tonic and
+#			octave included, False after the octave of each scale
+def calc_scale_table(scales=None):
+	if scales is None:
+		scales = SCALES
+	return pad_chord_intervals([calc_scale_semitones(scale) for scale in scales])
+
+##	@brief positions in a flat pitch table of every scale on every root and octave, in one broadcast
+#		@param scales names in SCALES or step sequences, defaults to all of SCALES
+#		@param roots pitch classes of the tonics, defaults to all 12
+#		@param octaves octaves of the tonics
+#		@param table_octaves octaves of the pitch table, such as ChordCatalog.octaves
+#		@return (indices, mask) arrays of shape (scales, roots, octaves, most notes per octave + 1),
+#			indices into all_notes and note_names.  padding and notes outside the table are -1 in
+#			indices and False in mask
+def calc_scale_indices(scales=None, roots=None, octaves=(4,), table_octaves=DEFAULT_OCTAVES):
+	if roots is None:
+		roots = np.arange(12)
+	semitones, mask = calc_scale_table(scales)
+	tonics = (np.asarray(octaves)[np.newaxis,:] - table_octaves[0]) * 12 + np.asarray(roots)[:,np.newaxis]
+	indices = tonics[np.newaxis,:,:,np.newaxis] + semitones[:,np.newaxis,np.newaxis,:]
+	mask = mask[:,np.newaxis,np.newaxis,:] & (indices >= 0) & (indices < len(table_octaves) * 12)
+	return np.where(mask, indices, -1), mask
+
+##	@brief generate note names matching the rows and columns of a pitch table
+#		@param prefixes pitch class names, such as CHROMATIC_PREFIXES
+#		@param octaves octave numbers, such as DEFAULT_OCTAVES
+#		@return list of note names, octave by octave
+@stage_profile.stage()
+def calc_note_names(prefixes, octaves=DEFAULT_OCTAVES):
+	return combine_prefix_suffix(prefixes, [str(octave) for octave in octaves], 'prefixes_first')
@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+
+## @file ordered_pool.py
+#	 @brief map a function over jobs in a process pool, results in order and few jobs in flight
+#
+#	 Executor.map submits every job before yielding the first result, so a long WAV file or
+#	 progression would hold all of its chunks in memory at once.  imap keeps a bounded queue of
+#	 futures instead and yields each result as soon as it and the ones before it are done.
+#
+#  @date 2026_10_16
+import collections
+import concurrent.futures
+
+# jobs in flight per worker, enough to keep every worker busy while the oldest result is consumed
+IN_FLIGHT = 2
+
+##	@brief results of function over jobs, in the order of jobs
+#		@param function picklable function run by pool workers
+#		@param jobs iterable of argument tuples, consumed lazily
+#		@param workers number of worker processes, None or 1 to run in this process
+#		@param in_flight jobs submitted ahead per worker, bounds memory to in_flight * workers results
+#		@return generator of function(*job) for each job
+def imap(function, jobs, workers=None, in_flight=IN_FLIGHT):
+	if workers is None or workers == 1:
+		for job in jobs:
+			yield function(*job)
+		return
+
+	with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+		pending = collections.deque()
+		for job in jobs:
+			pending.append(pool.submit(function, *job))
+			if len(pending) >= in_flight * workers:
+				yield pending.popleft().result()
+		while pending:
+			yield pending.popleft().result()
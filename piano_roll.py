@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+
+## @file piano_roll.py
+#	 @brief level of detail rendering of piano rolls and frequency over time plots
+#
+#	 instead of one artist or marker per note, notes are binned into an image with one column
+#	 per pixel of the axes and drawn with a single imshow.  notes with a duration are added to
+#	 their columns with a difference array and a cumulative sum, points such as spectral peaks
+#	 with np.histogram2d.  when the axes are zoomed or panned only the notes in the visible
+#	 window are binned again, found by binary search over their sorted start times, so drawing
+#	 costs time in the number of pixels and visible notes, not the length of the song.  the y
+#	 axis is in semitones (MIDI note numbers), labelled with note names or semitones.
+#
+#  @date 2026_10_16
+import argparse
+
+import numpy as np
+
+import music_theory
+
+AXIS_STYLES = ['note names', 'semitones']
+
+# columns of the image when the axes have no size yet
+DEFAULT_WIDTH = 1000
+
+##	@brief fractional MIDI note numbers of frequencies
+#		@param freqs array of frequencies in hz
+#		@param tuning name of a tuning in TUNINGS, or a (note name, frequency) reference pair
+#		@return float array, 69.0 for A4 in A440
+def freq_semitones(freqs, tuning='A440'):
+	quantized = music_theory.quantize_frequencies(freqs, tuning)
+	return quantized.midi + quantized.cents / 100.0
+
+## @brief SpanBinner notes with start and end times, binned into rows of one semitone
+class SpanBinner(object):
+
+	##	@param starts start times of the notes
+	#		@param ends end times of the notes
+	#		@param notes MIDI note numbers
+	#		@param weights value added per note, such as velocity, defaults to 1
+	def __init__(self, starts, ends, notes, weights=None):
+		order = np.argsort(starts, kind='stable')
+		self.starts = np.asarray(starts, dtype=float)[order]
+		self.ends = np.asarray(ends, dtype=float)[order]
+		self.notes = np.asarray(notes, dtype=np.intp)[order]
+		self.weights = np.ones(len(order)) if weights is None else np.asarray(weights, dtype=float)[order]
+		self.longest = (self.ends - self.starts).max() if len(order) else 0.0
+		self.extent = (self.starts.min(), self.ends.max(), self.notes.min() - 0.5, self.notes.max() + 0.5) if len(order) else (0, 1, 59.5, 72.5)
+
+	##	@brief image of the notes in a window
+	#		@param x0, x1 time window
+	#		@param y0, y1 note window
+	#		@param width columns of the image
+	#		@param height rows on screen, unused, every semitone is one row
+	#		@return (image of shape (rows, width), extent of the image)
+	def __call__(self, x0, x1, y0, y1, width, height):
+		low, high = int(np.floor(y0 + 0.5)), int(np.ceil(y1 - 0.5))
+		rows = max(high - low + 1, 1)
+
+		# notes overlapping the window start at most the longest note before it
+		first, last = np.searchsorted(self.starts, [x0 - self.longest, x1])
+		starts, ends, notes, weights = self.starts[first:last], self.ends[first:last], self.notes[first:last], self.weights[first:last]
+		visible = (ends > x0) & (notes >= low) & (notes <= high)
+		starts, ends, notes, weights = starts[visible], ends[visible], notes[visible] - low, weights[visible]
+
+		# +weight in the first column of a note, -weight after its last, summed along time
+		scale = width / float(x1 - x0)
+		first_column = np.clip(np.floor((starts - x0) * scale), 0, width).astype(np.intp)
+		end_column = np.clip(np.ceil((ends - x0) * scale), 0, width).astype(np.intp)
+		end_column = np.maximum(end_column, np.minimum(first_column + 1, width))
+		cells = np.concatenate([notes * (width + 1) + first_column, notes * (width + 1) + end_column])
+		diff = np.bincount(cells, np.concatenate([weights, -weights]), minlength=rows * (width + 1)).reshape(rows, width + 1)
+		return np.cumsum(diff[:,:-1], axis=1), (x0, x1, low - 0.5, low + rows - 0.5)
+
+## @brief PointBinner points such as spectral peaks, binned with np.histogram2d
+class PointBinner(object):
+
+	##	@param times times of the points
+	#		@param semitones fractional MIDI note numbers of the points, see freq_semitones
+	#		@param weights value added per point, such as magnitude, defaults to 1
+	def __init__(self, times, semitones, weights=None):
+		order = np.argsort(times, kind='stable')
+		self.times = np.asarray(times, dtype=float)[order]
+		self.semitones = np.asarray(semitones, dtype=float)[order]
+		self.weights = None if weights is None else np.asarray(weights, dtype=float)[order]
+		self.extent = (self.times.min(), self.times.max(), self.semitones.min() - 0.5, self.semitones.max() + 0.5) if len(order) else (0, 1, 59.5, 72.5)
+
+	##	@brief image of the points in a window, one bin per pixel
+	def __call__(self, x0, x1, y0, y1, width, height):
+		# points on either edge of the window are inside it, as in np.histogram2d
+		first = np.searchsorted(self.times, x0, side='left')
+		last = np.searchsorted(self.times, x1, side='right')
+		weights = None if self.weights is None else self.weights[first:last]
+		image, xedges, yedges = np.histogram2d(self.times[first:last], self.semitones[first:last],
+			bins=(width, max(height, 1)), range=((x0, x1), (y0, y1)), weights=weights)
+		return image.T, (x0, x1, y0, y1)
+
+## @brief RasterView one imshow kept at the resolution of its axes, rebinned on zoom and pan
+class RasterView(object):
+
+	##	@param ax matplotlib axes to draw on
+	#		@param binner SpanBinner or PointBinner
+	#		@param axis_style one of AXIS_STYLES
+	#		@param cmap colormap of the image
+	def __init__(self, ax, binner, axis_style='note names', cmap='Greys'):
+		import matplotlib.ticker
+		self.ax = ax
+		self.binner = binner
+		self.image = ax.imshow(np.zeros((1, 1)), extent=binner.extent, origin='lower', aspect='auto',
+			interpolation='nearest', cmap=cmap)
+		ax.set_xlim(binner.extent[:2])
+		ax.set_ylim(binner.extent[2:])
+
+		# ticks on whole semitones, found again for every zoom level
+		ax.yaxis.set_major_locator(matplotlib.ticker.MaxNLocator(nbins=24, integer=True))
+		if axis_style == 'note names':
+			ax.yaxis.set_major_formatter(matplotlib.ticker.FuncFormatter(
+				lambda y, pos: str(music_theory.midi_note_names(int(round(y))))))
+			ax.set_ylabel('Note Name')
+		else:
+			ax.yaxis.set_major_formatter(matplotlib.ticker.FuncFormatter(lambda y, pos: '%d' % round(y - 60)))
+			ax.set_ylabel('Semitones above C4')
+		ax.set_xlabel('Time (s)')
+
+		self.update()
+
+		# a zoom changes both limits, so only mark the image out of date and bin it once, when it is drawn
+		self.stale = False
+		ax.callbacks.connect('xlim_changed', self._limits_changed)
+		ax.callbacks.connect('ylim_changed', self._limits_changed)
+		draw = self.image.draw
+		def draw_binned(renderer):
+			if self.stale:
+				self.update()
+			draw(renderer)
+		self.image.draw = draw_binned
+
+	def _limits_changed(self, ax):
+		self.stale = True
+
+	##	@brief bin the visible window at the current pixel size of the axes
+	def update(self):
+		self.stale = False
+		x0, x1 = sorted(self.ax.get_xlim())
+		y0, y1 = sorted(self.ax.get_ylim())
+		box = self.ax.get_window_extent()
+		width = int(box.width) if box.width >= 1 else DEFAULT_WIDTH
+		image, extent = self.binner(x0, x1, y0, y1, width, int(box.height))
+		self.image.set_data(image)
+		self.image.set_extent(extent)
+		self.image.set_clim(0.0, max(float(image.max()), 1e-12))
+
+##	@brief piano roll of notes with durations
+#		@param starts start times in seconds
+#		@param ends end times in seconds
+#		@param notes MIDI note numbers
+#		@param ax matplotlib axes, a new figure if None
+#		@param axis_style one of AXIS_STYLES
+#		@return RasterView, its axes are .ax
+def plot_piano_roll(starts, ends, notes, ax=None, axis_style='note names'):
+	import matplotlib.pyplot as plt
+	if ax is None:
+		fig, ax = plt.subplots(figsize=(14, 6))
+	return RasterView(ax, SpanBinner(starts, ends, notes), axis_style)
+
+##	@brief frequency over time of points such as the spectral peaks of analyze_spectrum
+#		@param times times in seconds
+#		@param freqs frequencies in hz
+#		@param weights value per point, such as magnitude
+#		@param ax matplotlib axes, a new figure if None
+#		@param axis_style one of AXIS_STYLES
+#		@param tuning tuning of the semitone axis
+#		@return RasterView
+def plot_frequency_over_time(times, freqs, weights=None, ax=None, axis_style='note names', tuning='A440'):
+	import matplotlib.pyplot as plt
+	if ax is None:
+		fig, ax = plt.subplots(figsize=(14, 6))
+	return RasterView(ax, PointBinner(times, freq_semitones(freqs, tuning), weights), axis_style, cmap='magma')
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='piano roll of a MIDI file, or frequency over time of spectral peaks')
+	parser.add_argument('input', help='MIDI file, or CSV of peaks from analyze_spectrum.py')
+	parser.add_argument('-o', '--output', help='save the plot to this image instead of showing it')
+	parser.add_argument('--axis', choices=AXIS_STYLES, default='note names', help='y axis labels')
+	args = parser.parse_args(argv)
+
+	import matplotlib
+	if args.output:
+		matplotlib.use('Agg')
+	import matplotlib.pyplot as plt
+	if args.input.endswith('.csv'):
+		peaks = np.genfromtxt(args.input, delimiter=',', skip_header=1, usecols=(0, 1, 2))
+		view = plot_frequency_over_time(peaks[:,0], peaks[:,1], peaks[:,2], axis_style=args.axis)
+		view.ax.set_title(args.input)
+		fig = view.ax.figure
+	else:
+		import midi_songs
+		fig = midi_songs.plot_song(args.input, axis_style=args.axis)
+	if args.output:
+		fig.savefig(args.output, bbox_inches='tight')
+	else:
+		plt.show()
+
+if __name__ == '__main__':
+	main()
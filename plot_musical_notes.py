@@ -8,10 +8,40 @@
 #
 #	 @author eric victorson
 #  @date 2019_01_01
-import matplotlib.pyplot as plt
+import argparse
+import concurrent.futures
+import os
+
 import numpy as np
-import pandas as pd
-import matplotlib.ticker
+
+import stage_profile
+
+# note, chord and scale computations live in music_theory, which does not load matplotlib,
+# and are imported here for the plots and for existing callers of this script.
+# matplotlib is imported inside the plotting functions, only when a figure is drawn
+from music_theory import (CHROMATIC_PREFIXES, DEFAULT_OCTAVES, TUNINGS, CHORD_SUFFIXES,
+	CHORD_INTERVALS, ChordCatalog, ChordIndex, ChordShape,
+	calc_all_notes, calc_chord_freq_table, calc_chord_freqs, calc_note_index, calc_note_names,
+	calc_octave, calc_pitch_class_masks, calc_pitch_classes, calc_pitch_table, chords,
+	combine_prefix_suffix, get_chord_catalog, get_chord_index, pad_chord_intervals, parse_note_name,
+	step_names)
+
+__all__ = [
+	# re-exported from music_theory
+	'CHROMATIC_PREFIXES', 'DEFAULT_OCTAVES', 'TUNINGS', 'CHORD_SUFFIXES', 'CHORD_INTERVALS',
+	'ChordCatalog', 'ChordIndex', 'ChordShape',
+	'calc_all_notes', 'calc_chord_freq_table', 'calc_chord_freqs', 'calc_note_index', 'calc_note_names',
+	'calc_octave', 'calc_pitch_class_masks', 'calc_pitch_classes', 'calc_pitch_table', 'chords',
+	'combine_prefix_suffix', 'get_chord_catalog', 'get_chord_index', 'pad_chord_intervals', 'parse_note_name',
+	'step_names',
+	# plots
+	'label_steps', 'scatter_chords', 'diatonic_middle_c_notes', 'plot_diatonic_scale', 'plot_diatonic_scale_log',
+	'plot_chromatic_scale', 'plot_chromatic_scale_log', 'c_chord_figure', 'plot_c_chords',
+	'plot_c_chords_half_steps', 'plot_c_chord_intervals', 'plot_c_chord_notes', 'FOUR_CHORD_PROG',
+	'PROGRESSION_SEMITONES', 'progression_figure', 'plot_progression', 'plot_progression_notes', 'FIGURES',
+	# export and command line
+	'EXPORT_FORMATS', 'export_figure', 'export_figures', 'run', 'main',
+]
 
 ##	super long music theory notes section
 # different methods of musical pitch notation:
@@ -192,256 +222,97 @@ import matplotlib.ticker
 
 # is pythagorean tuning worth mentioning?
 
-## @brief chords generate chords
-#	 @param range individual range, such as C, or all
-#	 @return chord_dict dictionary of chords, where keys are chord name, and values are lists of pitches in the chord
-def chords(range):
-
-	# note: standard 88 key piano range is A0 - C8
-	note_name_prefixes = ['C','Cs','D','Ds','E','F','Fs','G','Gs','A','As','B']
-	note_name_suffixes = ['-1','0','1','2','3','4','5','6','7','8','9']								
-
-	note_names = combine_prefix_suffix(note_name_prefixes, note_name_suffixes, 'prefixes_first')
-
-	# 0 C,, 		sub-contra octave C0		marks the low end of human hearing, only A0, B0 keys on piano
-	# 1 C, 			contra octave C1
-	#	2 C 			great octave	C2
-	# 3 c 			small octave	C3
-	# 4 c' 			1-line octave (middle c)						C4
-	# 5 c" 			2-line octave (tenor c)							C5
-	# 6 c"' 		3-line octave (soprano c (high c))	C6
-	# 7 c"" 		4-line octave (double high c)				C7
-	# 8 c""' 		5-line octave (eighth octave)				C8
-		
-	# Fundamental frequencies for -1 octave:
-	#				C				Cs				D				Ds			E				F				Fs			G				Gs			A				As			B	
-	cf_1 = [8.1758, 8.6620, 9.1770, 9.7227, 10.301, 10.914, 11.563, 12.250, 12.979, 13.750, 14.568, 15.434]
-	
-	# calculate all possible notes of chromatic scale given -1 octave frequencies
-	all_notes = calc_all_notes(cf_1)
-
-	notes_dict = dict(zip(note_names, all_notes))
-	chord_name_prefixes = ['C','Cs','D','Ds','E','F','Fs','G','Gs','A','As','B']
-	chord_name_suffixes = [' ','m','7','m7','maj7','6','m6','6/9','5','9','m9','maj9',
-													'11','m11','13','m13','add9','add2','7-5','7+5','sus4','sus2',
-													'dim','m7b5','aug'] 
-	c_chord_name_prefixes = ['C']
-
-	chord_names = combine_prefix_suffix(chord_name_prefixes, chord_name_suffixes, 'suffixes_first')	
-	
-	c_chord_names = combine_prefix_suffix(c_chord_name_prefixes, chord_name_suffixes, 'suffixes_first')
-	print("Generated chord names for all possible chords of structure:\n")
-	print(c_chord_names)
-
-	# intervals in number of semitones
-	# interval        semitones
-	root 							= 0
-	minor_second 			= 1
-	major_second 			= 2
-	minor_third 			= 3
-	major_third 			= 4
-	perfect_fourth 		= 5
-	diminished_fifth 	= 6
-	perfect_fifth 		= 7
-	minor_sixth 			= 8
-	major_sixth 			= 9
-	minor_seventh 		= 10
-	major_seventh 		= 11
-	perfect_octave 		= 12
-	minor_ninth 			= 13
-	major_ninth 			= 14
-	minor_tenth 			= 15
-	major_tenth 			= 16
-	eleventh 					= 17
-	thirteenth 				= 21
-
-	# chord intervals
-	i0 = [root, major_third, perfect_fifth]																											# C
-	i1 = [root, minor_third, perfect_fifth]																											# Cm
-	i2 = [root, major_third, perfect_fifth, minor_seventh]																			# C7
-	i3 = [root, minor_third, perfect_fifth, minor_seventh]																			# Cm7
-	i4 = [root, major_third, perfect_fifth, major_seventh]																			# Cmaj7
-	i5 = [root, major_third, perfect_fifth, major_sixth]																				# C6
-	i6 = [root, minor_third, perfect_fifth, major_sixth]																				# Cm6
-	i7 = [root, major_third, perfect_fifth, major_sixth, major_ninth]														# C6/9 / C6add9
-	i8 = [root, perfect_fifth]																																	# C5
-	i9 = [root, major_third, perfect_fifth, minor_seventh, major_ninth]													# C9
-	i10 = [root, minor_third, perfect_fifth, minor_seventh, major_ninth]												# Cm9
-	i11 = [root, major_third, perfect_fifth, major_seventh, major_ninth]												# Cmaj9
-	i12 = [root, major_third, perfect_fifth, minor_seventh, major_ninth, eleventh]							# C11
-	i13 = [root, minor_third, perfect_fifth, minor_seventh, major_ninth, eleventh]							# Cm11
-	i14 = [root, major_third, perfect_fifth, minor_seventh, major_ninth, eleventh, thirteenth]	# C13
-	i15 = [root, minor_third, perfect_fifth, minor_seventh, major_ninth, eleventh, thirteenth]	# Cm13
-	i16 = [root, major_third, perfect_fifth, major_ninth]																				# Cadd9
-	i17 = [root, major_second, major_third, perfect_fifth]																			# Cadd2
-	i18 = [root, major_third, diminished_fifth, minor_seventh]																	# C7-5
-	i19 = [root, major_third, minor_sixth, minor_seventh]																				# C7+5
-	i20 = [root, perfect_fourth, perfect_fifth]																									# Csus4
-	i21 = [root, major_second, perfect_fifth]																										# Csus2
-	i22 = [root, minor_third, diminished_fifth]																									# Cdim
-	i23 = [root, minor_third, diminished_fifth, minor_seventh]																	# Cm7b5
-	i24 = [root, major_third, minor_sixth]																											# Caug
-	
-	chord_intervals = [i0,i1,i2,i3,i4,i5,i6,i7,i8,i9,i10,i11,i12,i13,i14,i15,i16,i17,i18,i19,i20,i21,i22,i23,i24]
-	
-	middle_c_chromatic = ['C4','Cs4','D4','Ds4','E4','F4','Fs4','G4','Gs4','A5','As5','B5']
-	
-	temp_chord_frequencies = []
-	chord_frequencies= []
-	root_note_c4 = 'C4'
-	c_chord_frequencies = calc_chord_freqs(chord_names, chord_intervals, root_note_c4, notes_dict, all_notes)
-
-	# populate chord_frequencies list with all frequencies for all notes from the first to seventh scale degree of middle c major
-	# will return a list: list[[c_chords], [cs_chords],.., [b_chords]]
-	# where c_chords is a list, and each entry in c_chords is a list.  list of lists of lists
-	for root_note in middle_c_chromatic:
-		temp_chord_frequencies.append(calc_chord_freqs(chord_names, chord_intervals, root_note, notes_dict, all_notes))
-
-	# need to flatten this list of lists of lists to a list of lists
-	# for chords in list	(c_chords)
-	for outer in temp_chord_frequencies:
-		# for item in c_chords	(chord) in c_chords
-		for inner in outer:
-			chord_frequencies.append(inner)
-	
-	# scale degrees
-	#root_note = 'C4'	# I
-	#root_note = 'D4'	# II
-	#root_note = 'E4'	# III
-	#root_note = 'F4'	# IV
-	#root_note = 'G4'	# V
-	#root_note = 'A5'	# VI
-	#root_note = 'B5' # VII
-	#root_note = 'C5' # VIII
-
-	c_chord_dict = dict(zip(c_chord_names, c_chord_frequencies))
-	chord_dict = dict(zip(chord_names, chord_frequencies))
-	if range == 'c': 
-		return c_chord_dict
-	if range == 'all':
-		return chord_dict 
-
-# pass in all chord names, intervals, the name of the root note, and the notes - freq dictionary
-# return chord frequencies
-def calc_chord_freqs(chord_names, chord_intervals, root_note, notes_dict, all_notes):
-	chord_frequencies = []
-	
-	# determine the frequency of the root note
-	root_note_freq = notes_dict[root_note]
-
-	# find this frequency's position in the all_notes list
-	pos = 0
-	for i in all_notes: 
-		if i == root_note_freq:
-			break
-		pos = pos + 1
-
-	# take the position of the frequency in the all_notes list and calculate what frequencies
-	# are present in the chord given the intervals present in the chord
-
-	for chord in chord_intervals:
-		# empty list for each chord
-		chord_freq = []
-		# for each note in each chord, determine the interval above the tonic note
-		for interval in chord:	
-			chord_freq.append(all_notes[pos + interval])
-		chord_frequencies.append(chord_freq)
-
-	# the chord_frequencies list should now contain a list of all frequencies present for each chord
-	return chord_frequencies
- 
-##	@brief combine prefixes and suffixes for creating all notes
-#		@param prefixes note or chord prefixes, such as 'A','As','B',...
-#		@param suffixes note or chord suffixes, such as '0','1','2',... or 'm','7','m7','maj7',... etc
-#		@param order dictates if the prefixes should be iterated over first or suffixes
-#		@return combined list
-def combine_prefix_suffix(prefixes, suffixes, order):
-	combined = [];
-	if order == 'prefixes_first':
-		# iterate over all suffixes
-		for suff in suffixes:
-			# iterate over all prefixes
-				for pre in prefixes:
-					combined.append(pre+suff)
-	
-	if order == 'suffixes_first':
-		for pre in prefixes:
-			for suff in suffixes:
-				combined.append(pre+suff)
-
-	return combined
-
-##	@brief calculate octaves
-#		@param input_pitch the input pitch
-#		@param num_octaves the number of octaves above input pitch to calc
-#		@return freq returned octave pitch
-def calc_octave(input_pitch, num_octaves):
-	freq = input_pitch * np.power(2,num_octaves)
-	return freq
-
-##	@brief calculate all notes and their corresponding frequencies from an input octave list
-#		@param input_scale input list of notes in a starting octave, usually -1 octave
-# 	@return freq_arr	list of all calculated frequencies
-def calc_all_notes(input_scale):
-	freq_arr=[]
-	for i in range(0,len(input_scale)):
-		for note in input_scale:
-			freq_arr.append(calc_octave(note, float(i)))	
-	return freq_arr
-
-##	@brief main do all the things (mostly plotting)
-def main():
-
-	# =============== DIATONIC SCALE==================
-	# note: standard 88 key piano range is A0 - C8
-	# helmholtz name
-	# negative 1 octave (should be inaudible to humans) # C-1
-	# C,, 		sub-contra octave C0		marks the low end of human hearing, only A0, B0 keys on piano
-	# C, 			contra octave C1
-	#	C 			great octave	C2
-	# c 			small octave	C3
-	# c' 			1-line octave (middle c)						C4
-	# c" 			2-line octave (tenor c)							C5
-	# c"' 		3-line octave (soprano c (high c))	C6
-	# c""			4-line octave (double high c)				C7
-	# c""' 		5-line octave (eighth octave)				C8
-	
-	# notes above piano eighth octave
-	# C9
-	# C10
- 	
-	#				C					D				E				F				G				A				B
-	df_1 = [8.1758, 9.1770, 10.301, 10.914, 12.250, 13.750, 15.434]
-	all_diatonic_notes = calc_all_notes(df_1)
-	
-	diatonic_prefixes = ['C','D','E','F','G','A','B']
-	diatonic_suffixes = ['-1','0','1','2','3','4','5','6','7','8','9','10']
-	diatonic_note_names = combine_prefix_suffix(diatonic_prefixes, diatonic_suffixes, 'prefixes_first')
-
-	# notes in the fourth octave
-	diatonic_middle_c = all_diatonic_notes[34:44]
-	diatonic_middle_c_names = diatonic_note_names[34:44]
-
-	# plot diatonic scale
+##	@brief label the steps of a scale plotted at x = 0, 1, 2, ..., between each note and the next
+#		@param ax matplotlib axes to draw on
+#		@param freqs note frequencies in order, as plotted
+#		@param start index of the first note whose step to the next is labelled
+#		@param stop index after the last labelled note
+#		@return list of Text artists
+def label_steps(ax, freqs, start=0, stop=None):
+	if stop is None:
+		stop = len(freqs) - 1
+	names = step_names(freqs[start:stop + 1])
+	return [ax.text(i + 0.5, freqs[i], name, fontsize=12) for i, name in zip(range(start, stop), names)]
+
+##	@brief draw chords as vertical stacks of notes with a single scatter call
+#		@param ax matplotlib axes to draw on
+#		@param chord_table padded chord frequencies of shape (chords, max notes), nan for padding,
+#			such as from ChordCatalog.get_chord_table.  chord n is drawn at x = n
+#		@param lines also join the lowest and highest note of each chord with a LineCollection
+#		@return the scatter PathCollection
+def scatter_chords(ax, chord_table, lines=False):
+	import matplotlib.collections
+	import matplotlib.pyplot as plt
+	chord_table = np.asarray(chord_table, dtype=float)
+	valid = ~np.isnan(chord_table)
+	x = np.broadcast_to(np.arange(chord_table.shape[0])[:,np.newaxis], chord_table.shape)
+
+	# color each note by its position in the chord (root, third, fifth, ...) from the color cycle
+	cycle = plt.rcParams['axes.prop_cycle'].by_key()['color']
+	colors = np.array(cycle)[np.nonzero(valid)[1] % len(cycle)]
+
+	if lines:
+		lows = np.nanmin(chord_table, axis=1)
+		highs = np.nanmax(chord_table, axis=1)
+		segments = np.stack([np.stack([x[:,0], lows], axis=1), np.stack([x[:,0], highs], axis=1)], axis=1)
+		ax.add_collection(matplotlib.collections.LineCollection(segments, colors='0.7', zorder=1))
+	return ax.scatter(x[valid], chord_table[valid], c=colors, zorder=2)
+
+#============= DIATONIC SCALE ================
+
+# note: standard 88 key piano range is A0 - C8
+# helmholtz name
+# negative 1 octave (should be inaudible to humans) # C-1
+# C,, 		sub-contra octave C0		marks the low end of human hearing, only A0, B0 keys on piano
+# C, 			contra octave C1
+#	C 			great octave	C2
+# c 			small octave	C3
+# c' 			1-line octave (middle c)						C4
+# c" 			2-line octave (tenor c)							C5
+# c"' 		3-line octave (soprano c (high c))	C6
+# c""			4-line octave (double high c)				C7
+# c""' 		5-line octave (eighth octave)				C8
+
+# notes above piano eighth octave
+# C9
+# C10
+
+##	@brief notes of the diatonic scale around middle c
+#		@param tuning name of a tuning in TUNINGS
+#		@return (frequencies, note names) for B3 - D5
+def diatonic_middle_c_notes(tuning='A440'):
+	# white keys only:	C D E F G A B, from the step below C4 to the step above C5
+	return get_chord_catalog(tuning).scale_notes('ionian', 'C', 4, np.arange(-1, 9))
+
+##	@brief plot diatonic scale
+#		@param tuning name of a tuning in TUNINGS
+#		@return figure
+def plot_diatonic_scale(tuning='A440'):
+	import matplotlib.pyplot as plt
+	diatonic_middle_c, diatonic_middle_c_names = diatonic_middle_c_notes(tuning)
+
+	fig = plt.figure()
 	plt.plot(np.arange(len(diatonic_middle_c)), diatonic_middle_c,'-o')
 	ax = plt.gca()
 	ax.xaxis.set_ticks(np.arange(len(diatonic_middle_c_names)))
 	ax.xaxis.set_ticklabels(diatonic_middle_c_names, rotation=90)
 
-	plt.text(1.5, diatonic_middle_c[1], "T", fontsize=12)
-	plt.text(2.5, diatonic_middle_c[2], "T", fontsize=12)
-	plt.text(3.5, diatonic_middle_c[3], "S", fontsize=12)
-	plt.text(4.5, diatonic_middle_c[4], "T", fontsize=12)
-	plt.text(5.5, diatonic_middle_c[5], "T", fontsize=12)
-	plt.text(6.5, diatonic_middle_c[6], "T", fontsize=12)
-	plt.text(7.5, diatonic_middle_c[7], "S", fontsize=12)
+	label_steps(ax, diatonic_middle_c, 1, 8)
 	plt.xlabel("Notes")
 	plt.ylabel("Frequency (hz)")	
 	plt.title("Diatonic C Major Scale (Ionian Mode)")
 	plt.grid()
-	plt.show()
+	return fig
+
+##	@brief plot diatonic scale with semilog axes
+#		@param tuning name of a tuning in TUNINGS
+#		@return figure
+def plot_diatonic_scale_log(tuning='A440'):
+	import matplotlib.pyplot as plt
+	import matplotlib.ticker
+	diatonic_middle_c, diatonic_middle_c_names = diatonic_middle_c_notes(tuning)
 
-	# plot diatonic scale with semilog axes
+	fig = plt.figure()
 	plt.plot(np.arange(len(diatonic_middle_c)), diatonic_middle_c,'-o')
 	ax = plt.gca()
 	ax.set_yscale('log')
@@ -454,44 +325,43 @@ def main():
 	plt.ylabel("Frequency (logarithmic hz)")	
 	plt.title("Diatonic C Major Scale")
 	plt.grid()
-	plt.show()
-
-
-	#============= CHROMATIC SCALE ================
-	
-	# note: standard 88 key piano range is A0 - C8
-	# helmholtz name
-	# everything below this is just for science (-1 octave)
-	# C,, 		sub-contra octave C0		marks the low end of human hearing, only A0, B0 keys on piano
-	# C, 			contra octave C1
-	#	C 			great octave	C2
-	# c 			small octave	C3
-	# c' 			1-line octave (middle c)						C4
-	# c" 			2-line octave (tenor c)							C5
-	# c"' 		3-line octave (soprano c (high c))	C6
-	# c"" 		4-line octave (double high c)				C7
-	# c""' 		5-line octave (eighth octave)				C8
-	# everything above this is just for science	(9 and 10 octave)
-
-	# Fundamental frequencies:
-	#				C				Cs				D				Ds			E				F				Fs			G				Gs			A				As			B	
-	cf_1 = [8.1758, 8.6620, 9.1770, 9.7227, 10.301, 10.914, 11.563, 12.250, 12.979, 13.750, 14.568, 15.434];
-	
-	all_notes = calc_all_notes(cf_1)
-
-	
-	chromatic_prefixes = ['C','Cs','D','Ds','E','F','Fs','G','Gs','A','As','B']
-	chromatic_suffixes = ['-1','0','1','2','3','4','5','6','7','8','9','10']
-	note_names = combine_prefix_suffix(chromatic_prefixes, chromatic_suffixes, 'prefixes_first')
-
-	notes_dict = dict(zip(note_names, all_notes))
-	middle_c = all_notes[59:73]
-	middle_c_names = note_names[59:73]
+	return fig
+
+
+#============= CHROMATIC SCALE ================
+
+# note: standard 88 key piano range is A0 - C8
+# helmholtz name
+# everything below this is just for science (-1 octave)
+# C,, 		sub-contra octave C0		marks the low end of human hearing, only A0, B0 keys on piano
+# C, 			contra octave C1
+#	C 			great octave	C2
+# c 			small octave	C3
+# c' 			1-line octave (middle c)						C4
+# c" 			2-line octave (tenor c)							C5
+# c"' 		3-line octave (soprano c (high c))	C6
+# c"" 		4-line octave (double high c)				C7
+# c""' 		5-line octave (eighth octave)				C8
+# everything above this is just for science	(9 and 10 octave)
+
+# to convert to wavelength 
+#c = 343 # (m/s)
+#wavelength = c / all_notes; 
+
+# formulaic representation of frequency of the nth key
+#ff = 2^((n-49)/12) * 440 # (hz), key 49 being A4 (middle A))
+
+##	@brief plot chromatic scale
+#		@param tuning name of a tuning in TUNINGS
+#		@return figure
+def plot_chromatic_scale(tuning='A440'):
+	import matplotlib.pyplot as plt
+	middle_c, middle_c_names = get_chord_catalog(tuning).scale_notes('chromatic', 'C', 4, np.arange(-1, 13))
 	root = middle_c[0]	
 	x = np.linspace(0,13,14)
 	y = root*(np.power(2,x/12))
 
-	# plot chromatic scale
+	fig = plt.figure()
 	plt.plot(np.arange(len(middle_c)), middle_c,'-o', markersize = 12)
 	plt.plot(x,y,'go--')
 	ax = plt.gca()
@@ -501,22 +371,19 @@ def main():
 	plt.xlabel("Notes")
 	plt.ylabel("Frequency (hz)")	
 	plt.title("Chromatic C4 Scale")
-	plt.text(1.5, middle_c[1], "S", fontsize=12)
-	plt.text(2.5, middle_c[2], "S", fontsize=12)
-	plt.text(3.5, middle_c[3], "S", fontsize=12)
-	plt.text(4.5, middle_c[4], "S", fontsize=12)
-	plt.text(5.5, middle_c[5], "S", fontsize=12)
-	plt.text(6.5, middle_c[6], "S", fontsize=12)
-	plt.text(7.5, middle_c[7], "S", fontsize=12)
-	plt.text(8.5, middle_c[8], "S", fontsize=12)
-	plt.text(9.5, middle_c[9], "S", fontsize=12)
-	plt.text(10.5, middle_c[10], "S", fontsize=12)
-	plt.text(11.5, middle_c[11], "S", fontsize=12)
+	label_steps(ax, middle_c, 1, 12)
 	plt.grid()
-	plt.show()
+	return fig
 	
-	# plot chromatic scale on semilog plot
-	plt.figure()
+##	@brief plot chromatic scale on semilog plot
+#		@param tuning name of a tuning in TUNINGS
+#		@return figure
+def plot_chromatic_scale_log(tuning='A440'):
+	import matplotlib.pyplot as plt
+	import matplotlib.ticker
+	middle_c, middle_c_names = get_chord_catalog(tuning).scale_notes('chromatic', 'C', 4, np.arange(-1, 13))
+
+	fig = plt.figure()
 	plt.plot(np.arange(len(middle_c)), middle_c,'-o')
 	ax = plt.gca()
 	ax.set_yscale('log')
@@ -531,160 +398,248 @@ def main():
 	#plt.ylim([middle_c[0]*0.9, middle_c[len(middle_c)-1]*1.1])
 	plt.ylim([200,600])
 
-	plt.text(1.5, middle_c[0], "S", fontsize=12)
-	plt.text(2.5, middle_c[1], "S", fontsize=12)
-	plt.text(3.5, middle_c[2], "S", fontsize=12)
-	plt.text(4.5, middle_c[3], "S", fontsize=12)
-	plt.text(5.5, middle_c[4], "S", fontsize=12)
-	plt.text(6.5, middle_c[5], "S", fontsize=12)
-	plt.text(7.5, middle_c[6], "S", fontsize=12)
-	plt.text(8.5, middle_c[7], "S", fontsize=12)
-	plt.text(9.5, middle_c[8], "S", fontsize=12)
-	plt.text(10.5, middle_c[9], "S", fontsize=12)
-	plt.text(11.5, middle_c[10], "S", fontsize=12)
+	label_steps(ax, middle_c, 1, 12)
 	plt.grid(True, which='both')
-	plt.show()
+	return fig
 
-	# to convert to wavelength 
-	#c = 343 # (m/s)
-	#wavelength = c / all_notes; 
 
-	# formulaic representation of frequency of the nth key
-	#ff = 2^((n-49)/12) * 440 # (hz), key 49 being A4 (middle A))
-	
-	###### plot C major chords #######
-	chords_dict = chords('c')
+###### plot C major chords #######
 
-	plt.figure
-	plt.hold(True)
-	idx = 0
-	for key, value in chords_dict.iteritems():
-		for pitch in value:
-			plt.scatter(idx, pitch)
-		idx = idx + 1
+##	@brief start a figure of the C chords, drawn with a single scatter
+#		@param tuning name of a tuning in TUNINGS
+#		@return (figure, axes, C chord names)
+def c_chord_figure(tuning='A440'):
+	import matplotlib.pyplot as plt
+	# padded chord frequencies, one row per chord
+	c_chord_names = list(chords('c', tuning).keys())
+	c_chord_table = get_chord_catalog(tuning).get_chord_table(c_chord_names)
 
+	fig = plt.figure()
 	ax = plt.gca()
-	ax.set_xticks(np.arange(len(chords_dict.keys())))
-	ax.set_xticklabels(chords_dict.keys(), rotation=90)
-	ax.set_yticks([250,300,350,400,450,500,550,600,650,700,750,800,850,900])
-	plt.xlim([-1,(len(chords_dict.keys())+1)])
+	scatter_chords(ax, c_chord_table)
+	ax.set_xticks(np.arange(len(c_chord_names)))
+	ax.set_xticklabels(c_chord_names, rotation=90)
+	plt.xlim([-1,(len(c_chord_names)+1)])
 	ax.grid(True)
+	return fig, ax, c_chord_names
+
+##	@brief plot C chord frequencies
+#		@param tuning name of a tuning in TUNINGS
+#		@return figure
+def plot_c_chords(tuning='A440'):
+	import matplotlib.pyplot as plt
+	fig, ax, c_chord_names = c_chord_figure(tuning)
+	ax.set_yticks([250,300,350,400,450,500,550,600,650,700,750,800,850,900])
 	plt.title('C Chord Frequencies')
 	plt.ylabel('Frequency (hz)')
-	plt.show()
-
-	# plot with y ticks at every half step
-	plt.figure
-	plt.hold(True)
-	idx = 0
-	for key, value in chords_dict.iteritems():
-		for pitch in value:
-			plt.scatter(idx, pitch)
-		idx = idx + 1
-
-	c_chord_pitches = all_notes[60:82]
-	ax = plt.gca()
-	ax.set_xticks(np.arange(len(chords_dict.keys())))
-	ax.set_xticklabels(chords_dict.keys(), rotation=90)
+	return fig
+
+##	@brief plot C chord frequencies with y ticks at every half step
+#		@param tuning name of a tuning in TUNINGS
+#		@return figure
+def plot_c_chords_half_steps(tuning='A440'):
+	import matplotlib.pyplot as plt
+	fig, ax, c_chord_names = c_chord_figure(tuning)
+	c_chord_pitches = get_chord_catalog(tuning).scale_notes('chromatic', 'C', 4, np.arange(22))[0]
 	ax.set_yticks(c_chord_pitches)
-	plt.xlim([-1,(len(chords_dict.keys())+1)])
-	ax.grid(True)
 	plt.title('C Chord Frequencies')
 	plt.ylabel('Frequency (hz)')
-	plt.show()
-
-	# plot with y ticks being interval numbers in semitones
-	plt.figure
-	plt.hold(True)
-	idx = 0
-	for key, value in chords_dict.iteritems():
-		for pitch in value:
-			plt.scatter(idx, pitch)
-		idx = idx + 1
-
-	c_chord_pitches = all_notes[60:82]
-	ax = plt.gca()
-	ax.set_xticks(np.arange(len(chords_dict.keys())))
-	ax.set_xticklabels(chords_dict.keys(), rotation=90)
+	return fig
+
+##	@brief plot C chords with y ticks being interval numbers in semitones
+#		@param tuning name of a tuning in TUNINGS
+#		@return figure
+def plot_c_chord_intervals(tuning='A440'):
+	import matplotlib.pyplot as plt
+	fig, ax, c_chord_names = c_chord_figure(tuning)
+	c_chord_pitches = get_chord_catalog(tuning).scale_notes('chromatic', 'C', 4, np.arange(22))[0]
 	ax.set_yticks(c_chord_pitches)
-	ax.set_yticklabels(['0','1','2','3','4','5','6','7','8','9','10','11','12','13','14','15','16','17','18','19','20','21'])
-	plt.xlim([-1,(len(chords_dict.keys())+1)])
-	ax.grid(True)
+	ax.set_yticklabels([str(semitone) for semitone in range(len(c_chord_pitches))])
 	plt.title('C Chord Intervals')
 	plt.ylabel('Intervals (semitones)')
-	plt.show()
+	return fig
 	
-	# finally, plot in terms of note name
-	plt.figure
-	plt.hold(True)
-	idx = 0
-	for key, value in chords_dict.iteritems():
-		for pitch in value:
-			plt.scatter(idx, pitch)
-		idx = idx + 1
-
-	chord_pitches = all_notes[60:83]
-	chord_note_names = note_names[60:83]
-	ax = plt.gca()
-	ax.set_xticks(np.arange(len(chords_dict.keys())))
-	ax.set_xticklabels(chords_dict.keys(), rotation=90)
+##	@brief finally, plot C chords in terms of note name
+#		@param tuning name of a tuning in TUNINGS
+#		@return figure
+def plot_c_chord_notes(tuning='A440'):
+	import matplotlib.pyplot as plt
+	fig, ax, c_chord_names = c_chord_figure(tuning)
+	chord_pitches, chord_note_names = get_chord_catalog(tuning).scale_notes('chromatic', 'C', 4, np.arange(23))
 	ax.set_yticks(chord_pitches)
 	ax.set_yticklabels(chord_note_names)
-	plt.xlim([-1,(len(chords_dict.keys())+1)])
-	ax.grid(True)
 	plt.title('C Chord Note Contents')
 	plt.ylabel('Note Name')
-	plt.show()
+	return fig
+
 
-	# quick little plot to show frequency content of the i-v-vi-iv chord progression
-	# plot 4 chord progression in terms of frequency content
-	all_chords_dict = chords('all')
-	four_chord_prog = ['C ','G ','Am','F ']
+# quick little plot to show frequency content of the i-v-vi-iv chord progression
+FOUR_CHORD_PROG = ['C ','G ','Am','F ']
 
-	plt.figure()
-	plt.hold(True)
-	idx = 0
+# semitones above C4 with a y tick in the progression plots
+PROGRESSION_SEMITONES = 30
 
-	chord_pitches = all_notes[60:90]
-	chord_note_names = note_names[60:90]
+##	@brief start a figure of the I-V-VI-IV progression
+#		@param tuning name of a tuning in TUNINGS
+#		@return (figure, axes)
+def progression_figure(tuning='A440'):
+	import matplotlib.pyplot as plt
+	catalog = get_chord_catalog(tuning)
+	prog_table = catalog.get_chord_table(FOUR_CHORD_PROG)
 
-	for chord in four_chord_prog:
-		tones = all_chords_dict[chord]
-		for tone in tones:
-			plt.scatter(idx, tone)
-		idx = idx + 1
+	fig = plt.figure()
 	ax = plt.gca()
-	ax.set_xticks(np.arange(len(four_chord_prog)))
-	ax.set_xticklabels(four_chord_prog, rotation=90)
-	ax.set_yticks(chord_pitches)
-  #ax.set_yticklabels(c_chord_note_names)
-  #plt.xlim([-1,(len(chords_dict.keys())+1)])
+	scatter_chords(ax, prog_table, lines=True)
+	ax.set_xticks(np.arange(len(FOUR_CHORD_PROG)))
+	ax.set_xticklabels(FOUR_CHORD_PROG, rotation=90)
+	ax.set_yticks(catalog.scale_notes('chromatic', 'C', 4, np.arange(PROGRESSION_SEMITONES))[0])
 	ax.grid(True)
 	plt.title('I-V-VI-IV C major Chord Progression')
+	return fig, ax
+
+##	@brief plot 4 chord progression in terms of frequency content
+#		@param tuning name of a tuning in TUNINGS
+#		@return figure
+def plot_progression(tuning='A440'):
+	import matplotlib.pyplot as plt
+	fig, ax = progression_figure(tuning)
 	plt.ylabel('Frequency (hz)')
-	plt.show()
+	return fig
+
+##	@brief plot 4 chord progression in terms of note names
+#		@param tuning name of a tuning in TUNINGS
+#		@return figure
+def plot_progression_notes(tuning='A440'):
+	import matplotlib.pyplot as plt
+	fig, ax = progression_figure(tuning)
+	ax.set_yticklabels(get_chord_catalog(tuning).scale_notes('chromatic', 'C', 4, np.arange(PROGRESSION_SEMITONES))[1])
+	plt.ylabel('Note Name')
+	return fig
+
+
+# every figure main() can show or export, in display order
+FIGURES = {
+	'diatonic': plot_diatonic_scale,
+	'diatonic_log': plot_diatonic_scale_log,
+	'chromatic': plot_chromatic_scale,
+	'chromatic_log': plot_chromatic_scale_log,
+	'c_chords': plot_c_chords,
+	'c_chords_half_steps': plot_c_chords_half_steps,
+	'c_chord_intervals': plot_c_chord_intervals,
+	'c_chord_notes': plot_c_chord_notes,
+	'progression': plot_progression,
+	'progression_notes': plot_progression_notes,
+}
+
+EXPORT_FORMATS = ['png', 'svg', 'pdf']
+
+##	@brief set up a pool worker process: the Agg backend, and profiling if the parent profiles
+def _init_export_worker(profile=False, trace_memory=False):
+	import matplotlib.pyplot as plt
+	plt.switch_backend('Agg')
+	if profile:
+		stage_profile.enable(trace_memory)
+
+##	@brief render one figure and save it in each format
+#		@param name figure name, a key of FIGURES
+#		@param output_dir directory to write to
+#		@param formats file formats, such as ['png','pdf']
+#		@param tuning name of a tuning in TUNINGS
+#		@return list of written file paths
+def export_figure(name, output_dir='.', formats=('png',), tuning='A440'):
+	import matplotlib.pyplot as plt
+	with stage_profile.section('figure.' + name):
+		fig = FIGURES[name](tuning)
+	paths = []
+	for fmt in formats:
+		path = os.path.join(output_dir, '%s_%s.%s' % (name, tuning, fmt))
+		with stage_profile.section('savefig.' + fmt):
+			fig.savefig(path, bbox_inches='tight')
+		paths.append(path)
+	plt.close(fig)
+	return paths
+
+##	@brief export_figure in a pool worker, with the stage report of the job when profiling
+def _export_job(name, output_dir, formats, tuning):
+	return export_figure(name, output_dir, formats, tuning), stage_profile.take_report()
+
+##	@brief render figures on the Agg backend in a process pool and save them to files
+#		@param names figure names, keys of FIGURES, defaults to all figures
+#		@param output_dir directory to write to, created if needed
+#		@param formats file formats, such as ['png','pdf']
+#		@param tunings names of tunings in TUNINGS, every figure is exported for each
+#		@param workers number of worker processes, None for one per cpu, 1 to render in this process
+#		@return list of written file paths
+def export_figures(names=None, output_dir='.', formats=('png',), tunings=('A440',), workers=None):
+	if names is None:
+		names = list(FIGURES)
+	os.makedirs(output_dir, exist_ok=True)
+	jobs = [(name, tuning) for tuning in tunings for name in names]
+
+	if workers == 1:
+		# render on Agg here too, and give the caller back its backend and display afterwards
+		import matplotlib.pyplot as plt
+		backend = plt.get_backend()
+		plt.switch_backend('Agg')
+		try:
+			return [path for name, tuning in jobs for path in export_figure(name, output_dir, formats, tuning)]
+		finally:
+			plt.switch_backend(backend)
+
+	# stage reports of the workers are merged into this process, their times are summed
+	with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_export_worker,
+			initargs=(stage_profile.is_enabled(), stage_profile.is_tracing_memory())) as pool:
+		futures = [pool.submit(_export_job, name, output_dir, formats, tuning) for name, tuning in jobs]
+		paths = []
+		for future in futures:
+			job_paths, report = future.result()
+			stage_profile.merge(report)
+			paths.extend(job_paths)
+		return paths
+
+##	@brief show, explore or export the figures chosen on the command line
+def run(args):
+	if args.export:
+		paths = export_figures(args.figures, args.output_dir, args.formats, args.tunings, args.workers)
+		print("wrote %d files to %s" % (len(paths), args.output_dir))
+		return
+
+	if args.explore:
+		import music_explorer
+		music_explorer.MusicExplorer(args.tunings[0]).show()
+		return
+
+	import matplotlib.pyplot as plt
+	for tuning in args.tunings:
+		for name in args.figures:
+			with stage_profile.section('figure.' + name):
+				FIGURES[name](tuning)
+			plt.show()
 
 
-	# plot 4 chord progression in terms of note names
-	plt.figure()
-	plt.hold(True)
-	idx = 0
-	for chord in four_chord_prog:
-		tones = all_chords_dict[chord]
-		for tone in tones:
-			plt.scatter(idx, tone)
-		idx = idx + 1
+##	@brief main do all the things (mostly plotting)
+#		shows each figure in turn, or with --export writes them to files without a display
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='plot musical scales, chords and chord progressions')
+	parser.add_argument('--export', action='store_true', help='write figures to files instead of showing them')
+	parser.add_argument('--explore', action='store_true', help='open the interactive explorer instead of the figures')
+	parser.add_argument('--figures', nargs='+', choices=list(FIGURES), default=list(FIGURES), help='figures to draw')
+	parser.add_argument('--output-dir', default='figures', help='directory for exported figures')
+	parser.add_argument('--formats', nargs='+', choices=EXPORT_FORMATS, default=['png'], help='exported file formats')
+	parser.add_argument('--tunings', nargs='+', choices=sorted(TUNINGS), default=['A440'], help='reference pitches')
+	parser.add_argument('--workers', type=int, default=None, help='export worker processes, default one per cpu')
+	parser.add_argument('--profile', metavar='JSON', help="write wall time and calls of each stage to this file, '-' for stdout")
+	parser.add_argument('--profile-memory', action='store_true', help='also record peak memory with tracemalloc, which slows the stages down')
+	args = parser.parse_args(argv)
+
+	if args.profile:
+		stage_profile.enable(args.profile_memory)
+	try:
+		run(args)
+	finally:
+		if args.profile:
+			stage_profile.write_report(stage_profile.disable(), args.profile)
 
-	ax = plt.gca()
-	ax.set_xticks(np.arange(len(four_chord_prog)))
-	ax.set_xticklabels(four_chord_prog, rotation=90)
-	ax.set_yticks(chord_pitches)
-	ax.set_yticklabels(chord_note_names)
-  #plt.xlim([-1,(len(chords_dict.keys())+1)])
-	ax.grid(True)
-	plt.title('I-V-VI-IV C major Chord Progression')
-	plt.ylabel('Note Name')
-	plt.show()
 
 
 if __name__ == '__main__':
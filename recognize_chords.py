@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+## @file recognize_chords.py
+#	 @brief recognize chords in chroma frames by matching them against chord templates
+#
+#	 every chord of the chords() vocabulary (12 roots x 25 chord types) becomes a column of a
+#	 12 x N template matrix, its pitch class set scaled to unit length.  a batch of chroma
+#	 vectors is scored against all templates with one matrix multiply (cosine similarity) and
+#	 the best template is the recognized chord.  frames are scored in chunks, so the
+#	 frames x N score matrix never has to exist for a whole song.
+#
+#  @date 2026_10_16
+import argparse
+
+import numpy as np
+
+import analyze_spectrum
+import music_theory
+
+# frames scored per matrix multiply
+CHUNK_FRAMES = 16384
+
+# chroma frames of a WAV file quieter than this are reported as no chord, about -60 dB full scale
+MIN_CHROMA_NORM = 1.0
+
+##	@brief template matrix of a chord index
+#		@param index ChordIndex, such as get_chord_index()
+#		@return float32 array of shape (12, chords), each column a unit length pitch class set
+def calc_chord_templates(index):
+	masks = np.array([shape.mask for shape in index.shapes])
+	templates = ((masks[np.newaxis,:] >> np.arange(12)[:,np.newaxis]) & 1).astype(np.float32)
+	return templates / np.linalg.norm(templates, axis=0, keepdims=True)
+
+## @brief ChordRecognizer best matching chord of every chroma frame
+class ChordRecognizer(object):
+
+	##	@param index ChordIndex whose chords are recognized, defaults to the chords() vocabulary
+	def __init__(self, index=None):
+		if index is None:
+			index = music_theory.get_chord_index()
+		self.chord_names = np.array([shape.name for shape in index.shapes])
+		self.templates = calc_chord_templates(index)
+
+	##	@brief recognize chords in chroma frames
+	#		@param chroma array of shape (frames, 12), C first
+	#		@param min_norm frames whose chroma vector is not longer than this are silent
+	#		@param chunk_frames frames scored per matrix multiply
+	#		@return (chord indices into chord_names, cosine scores), -1 / 0 for silent frames
+	def recognize(self, chroma, min_norm=0.0, chunk_frames=CHUNK_FRAMES):
+		chroma = np.asarray(chroma, dtype=np.float32)
+		chords = np.empty(len(chroma), dtype=np.int16)
+		scores = np.empty(len(chroma), dtype=np.float32)
+		for start in range(0, len(chroma), chunk_frames):
+			chunk = chroma[start:start + chunk_frames]
+			norms = np.linalg.norm(chunk, axis=1)
+			similarity = (chunk @ self.templates) / np.maximum(norms, np.finfo(np.float32).tiny)[:,np.newaxis]
+			best = np.argmax(similarity, axis=1)
+			silent = norms <= min_norm
+			chords[start:start + len(chunk)] = np.where(silent, -1, best)
+			scores[start:start + len(chunk)] = np.where(silent, 0.0, similarity[np.arange(len(chunk)), best])
+		return chords, scores
+
+	##	@brief names of recognized chords, '' where no chord was found
+	#		@param chords chord indices from recognize
+	def names(self, chords):
+		return np.where(chords >= 0, self.chord_names[np.maximum(chords, 0)], '')
+
+##	@brief chroma of every STFT frame of a WAV file, chunk by chunk
+#		@param path WAV file
+#		@param frame_size samples per frame
+#		@param hop_size samples between frame starts
+#		@param tuning tuning used to assign FFT bins to pitch classes
+#		@return generator of (frame times, chroma of shape (frames, 12)) per chunk
+def wav_chroma(path, frame_size=analyze_spectrum.FRAME_SIZE, hop_size=analyze_spectrum.HOP_SIZE, tuning='A440'):
+	layout = analyze_spectrum.read_wav_layout(path)
+	samples = analyze_spectrum.open_wav_memmap(path, layout)
+
+	# (bins x 12) matrix folding the power spectrum into pitch classes, audible bins only
+	bin_freqs = np.fft.rfftfreq(frame_size, 1.0 / layout.sample_rate)
+	audible = (bin_freqs >= 27.5) & (bin_freqs <= 4200.0)
+	pitch_classes = music_theory.calc_pitch_classes(np.where(audible, bin_freqs, 440.0), tuning)
+	folding = np.zeros((len(bin_freqs), 12), dtype=np.float32)
+	folding[np.nonzero(audible)[0], pitch_classes[audible]] = 1.0
+
+	window = np.hanning(frame_size).astype(np.float32)
+	total = max(0, (layout.frames - frame_size) // hop_size + 1)
+	for first in range(0, total, analyze_spectrum.CHUNK_FRAMES):
+		count = min(analyze_spectrum.CHUNK_FRAMES, total - first)
+		start = first * hop_size
+		mono = analyze_spectrum.read_mono(samples, layout, start, start + (count - 1) * hop_size + frame_size)
+		frames = np.lib.stride_tricks.sliding_window_view(mono, frame_size)[::hop_size]
+		power = np.abs(np.fft.rfft(frames * window, axis=1)) ** 2
+		times = (first + np.arange(count)) * hop_size / float(layout.sample_rate)
+		yield times, power.astype(np.float32) @ folding
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='recognize the chords of a WAV file')
+	parser.add_argument('wav', help='input WAV file')
+	parser.add_argument('--tuning', choices=sorted(music_theory.TUNINGS), default='A440', help='reference pitch')
+	args = parser.parse_args(argv)
+
+	# print a line whenever the recognized chord changes
+	recognizer = ChordRecognizer()
+	previous = None
+	for times, chroma in wav_chroma(args.wav, tuning=args.tuning):
+		chords, scores = recognizer.recognize(chroma, MIN_CHROMA_NORM)
+		changes = np.nonzero(np.diff(chords, prepend=-2 if previous is None else previous))[0]
+		for time, name, score in zip(times[changes], recognizer.names(chords[changes]), scores[changes]):
+			print("%10.3f  %-6s %.2f" % (time, name, score))
+		if len(chords):
+			previous = chords[-1]
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,174 @@
+## @file stage_profile.py
+#	 @brief wall time, call counts and peak memory of the stages of a run
+#
+#	 functions are marked as stages with the stage decorator, blocks of code with section.
+#	 while profiling is off a stage costs one global lookup per call.  enable() starts
+#	 recording: every stage gets its call count and wall time including and excluding the
+#	 stages it calls.  enable(trace_memory=True) also records the peak memory of every stage
+#	 above the memory in use when it was entered, from tracemalloc, at several times the wall
+#	 time.  the report is a JSON serializable dictionary, reports of worker processes can
+#	 be merged into the report of the parent.
+#
+#  @date 2026_10_16
+import contextlib
+import functools
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+REPORT_VERSION = 2
+
+# the active Profiler, None while profiling is off
+_profiler = None
+
+## @brief Profiler stage statistics of one process
+class Profiler(object):
+
+	##	@param trace_memory also record peak memory with tracemalloc, which slows allocations down
+	def __init__(self, trace_memory=False):
+		self.stats = {}
+		self.stack = []
+		self.trace_memory = trace_memory
+		self.own_tracing = trace_memory and not tracemalloc.is_tracing()
+		if self.own_tracing:
+			tracemalloc.start()
+		self.started = time.perf_counter()
+
+	def enter(self, name):
+		memory = 0
+		if self.trace_memory:
+			# the peak so far belongs to the enclosing stage, the new stage starts a fresh peak
+			memory, peak = tracemalloc.get_traced_memory()
+			if self.stack:
+				self.stack[-1][4] = max(self.stack[-1][4], peak)
+			tracemalloc.reset_peak()
+		# name, start time, time in called stages, memory at entry, highest peak of called stages
+		self.stack.append([name, time.perf_counter(), 0.0, memory, memory])
+
+	def exit(self):
+		name, start, child_time, memory, child_peak = self.stack.pop()
+		wall = time.perf_counter() - start
+		peak = max(tracemalloc.get_traced_memory()[1], child_peak) if self.trace_memory else 0
+		if self.stack:
+			self.stack[-1][2] += wall
+			self.stack[-1][4] = max(self.stack[-1][4], peak)
+
+		stats = self.stats.get(name)
+		if stats is None:
+			stats = self.stats[name] = {'calls': 0, 'wall_s': 0.0, 'self_s': 0.0, 'peak_bytes': 0}
+		stats['calls'] += 1
+		stats['wall_s'] += wall
+		stats['self_s'] += wall - child_time
+		stats['peak_bytes'] = max(stats['peak_bytes'], peak - memory)
+
+	##	@brief add the stages of another report, such as from a worker process
+	def merge(self, report):
+		for name, other in report['stages'].items():
+			stats = self.stats.setdefault(name, {'calls': 0, 'wall_s': 0.0, 'self_s': 0.0, 'peak_bytes': 0})
+			stats['calls'] += other['calls']
+			stats['wall_s'] += other['wall_s']
+			stats['self_s'] += other['self_s']
+			stats['peak_bytes'] = max(stats['peak_bytes'], other['peak_bytes'])
+
+	##	@brief the statistics so far
+	#		@return dictionary with the stages sorted by wall time, times in seconds
+	def report(self):
+		stages = sorted(self.stats.items(), key=lambda item: -item[1]['wall_s'])
+		return {
+			'version': REPORT_VERSION,
+			'argv': sys.argv,
+			'python': platform.python_version(),
+			'wall_s': time.perf_counter() - self.started,
+			'trace_memory': self.trace_memory,
+			'peak_bytes': tracemalloc.get_traced_memory()[1] if self.trace_memory else None,
+			'stages': dict((name, dict(stats, wall_s=round(stats['wall_s'], 6), self_s=round(stats['self_s'], 6)))
+				for name, stats in stages),
+		}
+
+	def stop(self):
+		if self.own_tracing:
+			tracemalloc.stop()
+
+##	@brief start recording stages in this process
+#		@param trace_memory also record peak memory with tracemalloc, which inflates the wall times
+def enable(trace_memory=False):
+	global _profiler
+	if _profiler is None:
+		_profiler = Profiler(trace_memory)
+
+##	@brief stop recording
+#		@return the report, None if profiling was off
+def disable():
+	global _profiler
+	profiler, _profiler = _profiler, None
+	if profiler is None:
+		return None
+	report = profiler.report()
+	profiler.stop()
+	return report
+
+def is_enabled():
+	return _profiler is not None
+
+def is_tracing_memory():
+	return _profiler is not None and _profiler.trace_memory
+
+##	@brief report of the stages so far, and start counting from zero, for jobs in worker processes
+#		@return the report, None if profiling is off
+def take_report():
+	if _profiler is None:
+		return None
+	report = _profiler.report()
+	_profiler.stats = {}
+	return report
+
+##	@brief add a report from another process to the active profiler
+def merge(report):
+	if _profiler is not None and report is not None:
+		_profiler.merge(report)
+
+##	@brief mark a function as a stage
+#		@param name stage name, defaults to module.function
+def stage(name=None):
+	def decorate(func):
+		stage_name = name or '%s.%s' % (func.__module__, func.__qualname__)
+
+		@functools.wraps(func)
+		def wrapper(*args, **kwargs):
+			profiler = _profiler
+			if profiler is None:
+				return func(*args, **kwargs)
+			profiler.enter(stage_name)
+			try:
+				return func(*args, **kwargs)
+			finally:
+				profiler.exit()
+		return wrapper
+	return decorate
+
+##	@brief mark a block of code as a stage
+#		@param name stage name
+@contextlib.contextmanager
+def section(name):
+	profiler = _profiler
+	if profiler is None:
+		yield
+		return
+	profiler.enter(name)
+	try:
+		yield
+	finally:
+		profiler.exit()
+
+##	@brief write a report as JSON
+#		@param report dictionary from disable
+#		@param path output file, '-' for stdout
+def write_report(report, path):
+	text = json.dumps(report, indent=1)
+	if path == '-':
+		print(text)
+		return
+	with open(path, 'w') as f:
+		f.write(text + '\n')
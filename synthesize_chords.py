@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+
+## @file synthesize_chords.py
+#	 @brief render chords and chord progressions to WAV audio
+#
+#	 additive synthesis of the chord frequencies from music_theory: every note is a sum of
+#	 sine harmonics with a short attack and release.  audio is generated in fixed-size blocks
+#	 by a generator and written with the standard library wave module, so memory does not
+#	 grow with the length of the progression.  blocks can be rendered by a process pool.
+#
+#  @date 2026_10_16
+import argparse
+import wave
+
+import numpy as np
+
+import music_theory
+import ordered_pool
+
+SAMPLE_RATE = 44100
+BLOCK_SIZE = 8192
+
+# relative amplitude of the 1st, 2nd, 3rd, ... harmonic of every note
+DEFAULT_HARMONICS = [1.0, 0.5, 0.25, 0.125]
+
+# attack and release time of every chord in seconds, avoids clicks at chord changes
+RAMP_TIME = 0.01
+
+# peak level of the output, as a fraction of full scale
+GAIN = 0.8
+
+## @brief Progression chords of a progression as padded arrays, ready for block synthesis
+#
+#	 the progression is played repeats times.  the arrays cover one pass, samples of later
+#	 passes are mapped back into it, so the size does not depend on repeats.
+class Progression(object):
+
+	##	@param chord_names chord names, such as ['C','G','Am','F']
+	#		@param durations seconds per chord, a single value or one per chord
+	#		@param repeats number of times the progression is played
+	#		@param tuning name of a tuning in TUNINGS, or a (note name, frequency) reference pair
+	#		@param harmonics relative amplitude of each harmonic
+	def __init__(self, chord_names, durations=1.0, repeats=1, tuning='A440', harmonics=DEFAULT_HARMONICS):
+		catalog = music_theory.get_chord_catalog(tuning)
+		chord_table = catalog.get_chord_table([catalog.resolve_name(name) for name in chord_names])
+
+		# every partial of every note: (chords, notes x harmonics) frequencies and amplitudes
+		harmonics = np.asarray(harmonics, dtype=float)
+		numbers = np.arange(1, len(harmonics) + 1)
+		valid = ~np.isnan(chord_table)
+		self.partials = (np.nan_to_num(chord_table)[:,:,np.newaxis] * numbers).reshape(len(chord_table), -1)
+		amplitudes = (valid[:,:,np.newaxis] * harmonics).reshape(len(chord_table), -1)
+		self.amplitudes = amplitudes / amplitudes.sum(axis=1, keepdims=True)
+
+		durations = np.broadcast_to(np.asarray(durations, dtype=float), (len(chord_table),))
+		self.ends = np.cumsum(durations)
+		self.starts = self.ends - durations
+		self.period = self.ends[-1]
+		self.repeats = repeats
+
+	##	@brief total length in seconds
+	def duration(self):
+		return self.period * self.repeats
+
+##	@brief synthesize one block of samples
+#		@param progression Progression to play
+#		@param start index of the first sample of the block
+#		@param length number of samples in the block
+#		@param sample_rate samples per second
+#		@return float array of samples in [-1, 1]
+def synthesize_block(progression, start, length, sample_rate=SAMPLE_RATE):
+	t = (start + np.arange(length)) / float(sample_rate)
+
+	# chord playing at each sample, and the time since it started
+	position = np.mod(t, progression.period)
+	chord = np.minimum(np.searchsorted(progression.ends, position, side='right'), len(progression.ends) - 1)
+	since = position - progression.starts[chord]
+	until = progression.ends[chord] - position
+
+	# sum of all partials of the chord at each sample, one (samples x partials) broadcast
+	phase = (2.0 * np.pi) * progression.partials[chord] * since[:,np.newaxis]
+	samples = np.einsum('ij,ij->i', np.sin(phase), progression.amplitudes[chord])
+
+	envelope = np.clip(np.minimum(since, until) / RAMP_TIME, 0.0, 1.0)
+	return np.where(t < progression.duration(), samples * envelope * GAIN, 0.0)
+
+##	@brief 16 bit PCM bytes of a block, for pool workers and wave
+def _render_block(progression, start, length, sample_rate):
+	samples = synthesize_block(progression, start, length, sample_rate)
+	return (samples * 32767.0).astype('<i2').tobytes()
+
+##	@brief stream a progression as 16 bit PCM blocks
+#		@param progression Progression to play
+#		@param sample_rate samples per second
+#		@param block_size samples per block, the last block may be shorter
+#		@param workers number of worker processes, None or 1 to render in this process
+#		@return generator of bytes, one block at a time and in order
+def synthesize_progression(progression, sample_rate=SAMPLE_RATE, block_size=BLOCK_SIZE, workers=None):
+	total = int(round(progression.duration() * sample_rate))
+	jobs = ((progression, start, min(block_size, total - start), sample_rate) for start in range(0, total, block_size))
+	# blocks are cheap to render, so more of them are kept in flight to hide the pool overhead
+	return ordered_pool.imap(_render_block, jobs, workers, in_flight=4)
+
+##	@brief write 16 bit mono PCM blocks to a WAV file
+#		@param path output file
+#		@param blocks iterable of PCM bytes, such as from synthesize_progression
+#		@param sample_rate samples per second
+#		@return number of samples written
+def write_wav(path, blocks, sample_rate=SAMPLE_RATE):
+	frames = 0
+	with wave.open(path, 'wb') as wav:
+		wav.setnchannels(1)
+		wav.setsampwidth(2)
+		wav.setframerate(sample_rate)
+		for block in blocks:
+			wav.writeframes(block)
+			frames += len(block) // 2
+	return frames
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='render a chord or chord progression to a WAV file')
+	parser.add_argument('chords', nargs='+', help="chord names, such as C G Am F")
+	parser.add_argument('-o', '--output', default='progression.wav', help='output WAV file')
+	parser.add_argument('--duration', type=float, default=1.0, help='seconds per chord')
+	parser.add_argument('--repeats', type=int, default=1, help='number of times to play the progression')
+	parser.add_argument('--tuning', choices=sorted(music_theory.TUNINGS), default='A440', help='reference pitch')
+	parser.add_argument('--sample-rate', type=int, default=SAMPLE_RATE, help='samples per second')
+	parser.add_argument('--workers', type=int, default=None, help='worker processes, default renders in this process')
+	args = parser.parse_args(argv)
+
+	progression = Progression(args.chords, args.duration, args.repeats, args.tuning)
+	frames = write_wav(args.output, synthesize_progression(progression, args.sample_rate, workers=args.workers), args.sample_rate)
+	print("wrote %.1f s to %s" % (frames / float(args.sample_rate), args.output))
+
+if __name__ == '__main__':
+	main()
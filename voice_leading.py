@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+## @file voice_leading.py
+#	 @brief voice a chord progression with the least total movement of the voices
+#
+#	 every chord of the progression gets the candidate voicings of chord_voicings with a fixed
+#	 number of voices.  the cost of moving from one voicing to the next is the sum of the
+#	 semitones each voice moves, computed for all candidate pairs at once as a (previous x next)
+#	 matrix.  a viterbi style dynamic program over the progression keeps the cheapest path to
+#	 every candidate and backtracks the best one, so the work grows linearly with the length
+#	 of the progression.  candidates and cost matrices are cached per chord and chord pair,
+#	 and progressions repeat the same few changes, so long progressions are cheap.
+#
+#  @date 2026_10_16
+import argparse
+
+import numpy as np
+
+import chord_voicings
+import music_theory
+
+# four voices between C3 and C6 by default
+VOICES = 4
+KEY_RANGE = (48, 84)
+
+## @brief VoiceLeader voicings of progressions with minimal voice movement, under fixed rules
+class VoiceLeader(object):
+
+	##	@param voices number of voices of every voicing
+	#		@param key_range (lowest, highest) MIDI note of any voice
+	#		@param max_span most semitones from the bass to the top voice
+	#		@param min_interval fewest semitones between neighbouring voices
+	#		@param max_doublings extra voices per pitch class
+	#		@param max_leap most semitones a voice may move between chords, None for no limit
+	#		@param allow_crossing False to forbid a voice from moving past the previous position of its neighbours
+	def __init__(self, voices=VOICES, key_range=KEY_RANGE, max_span=chord_voicings.MAX_SPAN,
+			min_interval=chord_voicings.MIN_INTERVAL, max_doublings=chord_voicings.MAX_DOUBLINGS,
+			max_leap=None, allow_crossing=True):
+		self.voices = voices
+		self.key_range = key_range
+		self.max_span = max_span
+		self.min_interval = min_interval
+		self.max_doublings = max_doublings
+		self.max_leap = max_leap
+		self.allow_crossing = allow_crossing
+		self.catalog = music_theory.get_chord_catalog()
+		self._candidates = {}
+		self._transitions = {}
+
+	##	@brief candidate voicings of a chord
+	#		@param chord_name chord name of the catalog
+	#		@return int16 array of shape (candidates, voices) of MIDI notes, lowest voice first
+	def candidates(self, chord_name):
+		if chord_name not in self._candidates:
+			batches = [notes[notes[:,-1] >= 0] for notes, inversions in chord_voicings.enumerate_voicings(chord_name,
+				self.key_range, None, self.voices, self.max_span, self.min_interval, self.max_doublings)]
+			notes = np.vstack(batches) if batches else np.empty((0, self.voices), dtype=np.int16)
+			if not len(notes):
+				raise ValueError("no %d voice voicing of %s in the key range" % (self.voices, chord_name.strip()))
+			self._candidates[chord_name] = notes
+		return self._candidates[chord_name]
+
+	##	@brief cost of moving between every pair of candidates of two chords
+	#		@return float array of shape (candidates of first, candidates of second), inf where forbidden
+	def transition(self, first, second):
+		key = (first, second)
+		if key not in self._transitions:
+			before = self.candidates(first).astype(np.int32)[:,np.newaxis,:]
+			after = self.candidates(second).astype(np.int32)[np.newaxis,:,:]
+			moves = np.abs(after - before)
+			cost = moves.sum(axis=2).astype(float)
+
+			forbidden = np.zeros(cost.shape, dtype=bool)
+			if self.max_leap is not None:
+				forbidden |= (moves > self.max_leap).any(axis=2)
+			if not self.allow_crossing:
+				forbidden |= (after[:,:,1:] < before[:,:,:-1]).any(axis=2) | (after[:,:,:-1] > before[:,:,1:]).any(axis=2)
+			cost[forbidden] = np.inf
+			self._transitions[key] = cost
+		return self._transitions[key]
+
+	##	@brief voice a progression
+	#		@param chord_names chord names, such as ['C','G','Am','F']
+	#		@return (voicings, cost) with voicings an int16 array of shape (chords, voices) of MIDI
+	#			notes and cost the total semitones moved
+	def lead(self, chord_names):
+		chord_names = [self.catalog.resolve_name(name) for name in chord_names]
+		if not chord_names:
+			return np.empty((0, self.voices), dtype=np.int16), 0.0
+
+		# cheapest total cost of reaching every candidate of the current chord, and how
+		total = np.zeros(len(self.candidates(chord_names[0])))
+		choices = []
+		for first, second in zip(chord_names[:-1], chord_names[1:]):
+			costs = total[:,np.newaxis] + self.transition(first, second)
+			choice = np.argmin(costs, axis=0)
+			total = costs[choice, np.arange(costs.shape[1])]
+			choices.append(choice)
+
+		best = int(np.argmin(total))
+		if not np.isfinite(total[best]):
+			raise ValueError("no voice leading of the progression meets the constraints")
+		path = [best]
+		for choice in reversed(choices):
+			path.append(int(choice[path[-1]]))
+		path.reverse()
+		voicings = np.array([self.candidates(name)[index] for name, index in zip(chord_names, path)])
+		return voicings, float(total[best])
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='voice a chord progression with the least voice movement')
+	parser.add_argument('chords', nargs='*', help="chord names, default the four chord progression C G Am F")
+	parser.add_argument('--voices', type=int, default=VOICES, help='number of voices')
+	parser.add_argument('--low', default='C3', help='lowest note of any voice')
+	parser.add_argument('--high', default='C6', help='highest note of any voice')
+	parser.add_argument('--max-leap', type=int, help='most semitones a voice may move between chords')
+	parser.add_argument('--no-crossing', action='store_true', help='forbid voices from crossing between chords')
+	args = parser.parse_args(argv)
+
+	leader = VoiceLeader(args.voices, (chord_voicings.note_midi(args.low), chord_voicings.note_midi(args.high)),
+		max_leap=args.max_leap, allow_crossing=not args.no_crossing)
+	chord_names = args.chords or ['C', 'G', 'Am', 'F']
+	voicings, cost = leader.lead(chord_names)
+	for chord_name, notes in zip(chord_names, voicings):
+		print("%-6s %s" % (chord_name, ' '.join(music_theory.midi_note_names(notes))))
+	print("total movement: %d semitones" % cost)
+
+if __name__ == '__main__':
+	main()